@@ -1,20 +1,37 @@
 import os
+import sys
 import logging
 from flask import Flask
 from flask_cors import CORS
 from database import db, init_db
 
+# Import orjson safely (faster JSON column serialization, optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 
 # Create Flask app
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "quantum_bb84_simulator_secret_key")
+app.json.compact = True  # Compact JSON responses, also in debug mode
 
 # Database configuration
 basedir = os.path.abspath(os.path.dirname(__file__))
 app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL') or f'sqlite:///{os.path.join(basedir, "quantum_experiments.db")}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+if ORJSON_AVAILABLE:
+    # Used by SQLAlchemy for the JSON columns in models.py
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'json_serializer': lambda obj: orjson.dumps(
+            obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ).decode(),
+        'json_deserializer': orjson.loads,
+    }
 
 # Initialize the database with the app
 init_db(app)
@@ -37,6 +54,24 @@ def init_database():
     except Exception as e:
         print(f"❌ Error creating database tables: {e}")
 
+def run_server(host: str = '0.0.0.0', port: int = 5000, debug: bool = False):
+    """Serve the app with waitress if installed; the Flask debug server is opt-in"""
+    if not debug:
+        # Multi-threaded WSGI server for the polling dashboards (optional)
+        try:
+            from waitress import serve
+        except ImportError:
+            serve = None
+        if serve is not None:
+            print(f"🚀 Starting server (waitress) on {host}:{port}")
+            print("💡 Use --debug for the Flask debug server")
+            serve(app, host=host, port=port, threads=8)
+            return
+    
+    # Development mode with Flask
+    print(f"🚀 Starting development server on {host}:{port}")
+    app.run(host=host, port=port, debug=debug, threaded=True)
+
 if __name__ == '__main__':
     init_database()
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    run_server(debug='--debug' in sys.argv[1:])
@@ -0,0 +1,51 @@
+"""
+JIT-compiled BB84 kernels
+Per-tick metric math for the continuous (photon-rate based) simulation
+"""
+
+import numpy as np
+
+# Import numba safely (JIT-compiled kernels, optional)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit so kernels remain importable"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+@njit(cache=True, fastmath=True)
+def continuous_poll_metrics(elapsed, photon_rate, loss_factor, base_qber, fluctuation):
+    """
+    Headline metrics reported by each continuous-simulation tick
+
+    loss_factor, base_qber: per-run constants from continuous_run_constants
+    fluctuation: uniform [-0.01, 0.01) draw scaling the sinusoidal QBER fluctuation
+
+    Returns:
+        (photons_sent, photons_received, qber, key_rate, quantum_advantage, quantum_fidelity)
+    """
+    photons_sent = int(photon_rate * elapsed)
+    photons_received = int(photons_sent * loss_factor)
+
+    # Dynamic QBER with realistic fluctuations
+    qber = max(0.0, base_qber + fluctuation * np.sin(elapsed * 0.5))
+
+    key_rate = 0.0
+    if elapsed > 0:
+        key_rate = max(0.0, photons_received * 0.5 * (1.0 - qber * 2.0) / elapsed)
+
+    quantum_advantage = max(20.0, 100.0 - qber * 1000.0)
+    quantum_fidelity = max(0.85, 1.0 - qber * 2.0)
+    return photons_sent, photons_received, qber, key_rate, quantum_advantage, quantum_fidelity
+
+def continuous_run_constants(distance, noise):
+    """Loop-invariant (loss_factor, base_qber, channel_efficiency) for one continuous run"""
+    loss_factor = (1.0 - distance * 0.01) * (1.0 - noise)
+    base_qber = noise * 0.5 + distance * 0.001
+    channel_efficiency = max(0.1, 1.0 - distance * 0.02 - noise)
+    return loss_factor, base_qber, channel_efficiency
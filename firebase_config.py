@@ -56,6 +56,18 @@ except Exception as e:
     FIREBASE_AVAILABLE = False
     db = None
 
+def _testbed_document(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Firestore document data for a testbed result"""
+    return {
+        'timestamp': time.time(),
+        'created_at': firestore.SERVER_TIMESTAMP,
+        'device_info': result.get('device_info', {}),
+        'metrics': result.get('metrics', {}),
+        'analysis': result.get('analysis', {}),
+        'is_secure': result.get('is_secure', False),
+        'user_id': 'anonymous'  # In a real app, this would be the authenticated user
+    }
+
 def save_testbed_result(result: Dict[str, Any]) -> bool:
     """Save testbed result to Firestore"""
     if not FIREBASE_AVAILABLE or db is None:
@@ -64,15 +76,7 @@ def save_testbed_result(result: Dict[str, Any]) -> bool:
     
     try:
         # Prepare document data
-        doc_data = {
-            'timestamp': time.time(),
-            'created_at': firestore.SERVER_TIMESTAMP,
-            'device_info': result.get('device_info', {}),
-            'metrics': result.get('metrics', {}),
-            'analysis': result.get('analysis', {}),
-            'is_secure': result.get('is_secure', False),
-            'user_id': 'anonymous'  # In a real app, this would be the authenticated user
-        }
+        doc_data = _testbed_document(result)
         
         # Add to Firestore
         doc_ref = db.collection('testbed_results').add(doc_data)
@@ -83,6 +87,25 @@ def save_testbed_result(result: Dict[str, Any]) -> bool:
         logger.error(f"Failed to save testbed result: {str(e)}")
         return False
 
+def save_testbed_results(results: List[Dict[str, Any]]) -> bool:
+    """Save several testbed results to Firestore in one batched write"""
+    if not FIREBASE_AVAILABLE or db is None:
+        logger.warning(f"Firebase not available, {len(results)} results not saved")
+        return False
+    
+    try:
+        batch = db.batch()
+        collection = db.collection('testbed_results')
+        for result in results:
+            batch.set(collection.document(), _testbed_document(result))
+        batch.commit()
+        logger.info(f"Saved {len(results)} testbed results to Firestore")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Failed to save testbed results: {str(e)}")
+        return False
+
 def get_testbed_results(limit: int = 50) -> List[Dict[str, Any]]:
     """Retrieve testbed results from Firestore"""
     if not FIREBASE_AVAILABLE or db is None:
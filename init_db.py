@@ -118,7 +118,7 @@ def init_database():
             photons_processed=8547,
             user_id=sample_user.id
         )
-        lab_session.parameters = '{"photon_rate": 50, "channel_loss": 10}'
+        lab_session.parameters = {"photon_rate": 50, "channel_loss": 10}
         db.session.add(lab_session)
         
         # Create sample collaborators
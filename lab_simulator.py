@@ -6,9 +6,13 @@ Comprehensive simulation considering all quantum channel parameters, security an
 import random
 import math
 import time
+import copy
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple, Any
-from enum import Enum
+from enum import Enum, IntEnum
 import logging
+from collections import deque
 
 # Import numpy safely
 try:
@@ -17,10 +21,77 @@ try:
 except ImportError:
     NUMPY_AVAILABLE = False
 
-class Basis(Enum):
-    RECTILINEAR = "rectilinear"  # + and | polarizations
-    DIAGONAL = "diagonal"        # ⤢ and ⤡ polarizations
-    CIRCULAR = "circular"        # Left and right circular polarizations (for six-state)
+# Import numba safely (JIT-compiled batch kernels, optional)
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit so kernels remain importable"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Display names for the supported protocol variants
+PROTOCOL_NAMES = {
+    'bb84': 'Standard BB84',
+    'decoy': 'Decoy State BB84',
+    'sarg04': 'SARG04 Protocol',
+    'six-state': 'Six-State BB84',
+    'custom': 'Custom BB84'
+}
+
+class Basis(IntEnum):
+    # Integer codes so basis sequences can be stored and compared as int8 arrays
+    RECTILINEAR = 0  # + and | polarizations
+    DIAGONAL = 1     # ⤢ and ⤡ polarizations
+    CIRCULAR = 2     # Left and right circular polarizations (for six-state)
+
+_BASES_BY_CODE = tuple(Basis)
+# Measurement basis lookup for a 4-basis choice (index 3 is the extended rectilinear basis)
+_BASES_BY_CHOICE_4 = _BASES_BY_CODE + (Basis.RECTILINEAR,)
+
+def _parse_bit_string(bits: str):
+    """Parse a '0'/'1' string into bit values, skipping non-digit markers such as '?'"""
+    if not NUMPY_AVAILABLE:
+        return [int(b) for b in bits if b.isdigit()]
+    arr = np.frombuffer(bits.encode('ascii', 'replace'), dtype=np.uint8)
+    digits = arr - ord('0')
+    return digits[digits <= 9].astype(np.int8)
+
+def _parse_basis_string(bases: str):
+    """Parse a '+'/'x' string into basis codes ('x' is diagonal, anything else rectilinear)"""
+    if not NUMPY_AVAILABLE:
+        return [Basis.DIAGONAL if b == 'x' else Basis.RECTILINEAR for b in bases]
+    arr = np.frombuffer(bases.encode('ascii', 'replace'), dtype=np.uint8)
+    return np.where(arr == ord('x'), Basis.DIAGONAL, Basis.RECTILINEAR).astype(np.int8)
+
+# Basis symbols and names accepted in basis lists (names are matched case-insensitively)
+_BASIS_SYMBOLS = {
+    '+': Basis.RECTILINEAR,
+    'x': Basis.DIAGONAL,
+    'rectilinear': Basis.RECTILINEAR,
+    'diagonal': Basis.DIAGONAL,
+    'circular': Basis.CIRCULAR,
+}
+
+def _basis_code(value) -> int:
+    """Basis code for a Basis value, a '+'/'x' symbol or a basis name (other strings are rectilinear)"""
+    if isinstance(value, str):
+        return _BASIS_SYMBOLS.get(value if len(value) == 1 else value.lower(), Basis.RECTILINEAR)
+    return int(value)
+
+def _basis_code_array(bases, length: int):
+    """Basis codes as an int8 array from a '+'/'x' string, a list of Basis values/symbols/names or a code array"""
+    if isinstance(bases, np.ndarray):
+        return bases[:length].astype(np.int8, copy=False)
+    if isinstance(bases, str):
+        return _parse_basis_string(bases[:length])
+    # Lists posted to /api/advanced_metrics may hold symbols such as '+'/'x' or names such as 'diagonal'
+    return np.fromiter(map(_basis_code, bases[:length]), dtype=np.int8, count=length)
 
 class AttackType(Enum):
     NO_ATTACK = "No Attack"
@@ -31,6 +102,8 @@ class AttackType(Enum):
 
 class QuantumPhoton:
     """Represents a quantum photon with polarization and basis"""
+    __slots__ = ('bit_value', 'basis', 'polarization', 'detected', 'corrupted', 'intensity', 'sarg04_state')
+    
     def __init__(self, bit_value: int, basis: Basis, polarization: float = 0.0, intensity: str = 'signal'):
         self.bit_value = bit_value  # 0 or 1
         self.basis = basis
@@ -40,13 +113,170 @@ class QuantumPhoton:
         self.intensity = intensity  # For decoy states: 'signal', 'decoy', 'vacuum'
         self.sarg04_state = None  # For SARG04: stores the 4-state encoding
 
+def _measurement_draws(rng, n):
+    """
+    Random inputs for Bob's measurement of n photons, drawn from rng
+    
+    Returns (draws, fallback_bits): draws is a (4, n) array of uniforms used for the basis
+    choice, detection, dark count and error decisions; fallback_bits are the random
+    outcomes of dark counts and mismatched-basis measurements.
+    """
+    return rng.random((4, n)), rng.integers(0, 2, size=n, dtype=np.int8)
+
+class _BulkDraws:
+    """
+    Scalar random draws for the per-photon code paths, served from blocks of a NumPy Generator
+
+    Mirrors the random-module calls it replaces (random, uniform, randint) so a seeded
+    simulator replays the same photon sequence. Fair 0/1 decisions consume consecutive
+    bits of an unpacked rng.bytes() block; all other draws come from rng.random() blocks.
+    """
+    __slots__ = ('_rng', '_block', '_bits', '_bit_pos', '_floats', '_float_pos')
+
+    def __init__(self, rng, block: int = 4096):
+        self._rng = rng
+        self._block = block
+        self._bits = []
+        self._bit_pos = 0
+        self._floats = []
+        self._float_pos = 0
+
+    def _bit(self) -> int:
+        if self._bit_pos == len(self._bits):
+            self._bits = np.unpackbits(
+                np.frombuffer(self._rng.bytes(self._block // 8), dtype=np.uint8)
+            ).tolist()
+            self._bit_pos = 0
+        bit = self._bits[self._bit_pos]
+        self._bit_pos += 1
+        return bit
+
+    def random(self) -> float:
+        """Uniform float in [0, 1)"""
+        if self._float_pos == len(self._floats):
+            self._floats = self._rng.random(self._block).tolist()
+            self._float_pos = 0
+        value = self._floats[self._float_pos]
+        self._float_pos += 1
+        return value
+
+    def uniform(self, a: float, b: float) -> float:
+        """Uniform float between a and b"""
+        return a + (b - a) * self.random()
+
+    def randint(self, a: int, b: int) -> int:
+        """Uniform integer in [a, b], inclusive like random.randint"""
+        if a == 0 and b == 1:
+            return self._bit()
+        return a + int(self.random() * (b - a + 1))
+
+@njit(parallel=True, cache=True)
+def measure_photons_batch(photon_bits, photon_bases, corrupted, num_bases, detection_prob,
+                          dark_rate_hz, custom_error_rate, window_ns, basis_prob, draws, fallback_bits):
+    """
+    Bob's measurement of a batch of photons (JIT-compiled when numba is available)
+    
+    Args:
+        photon_bits: Alice's bit values (int8 array)
+        photon_bases: Alice's Basis codes (int8 array)
+        corrupted: Eve-corruption flags (bool array)
+        num_bases: Number of measurement bases Bob chooses from (2, 3 or 4)
+        detection_prob: Combined channel and detector detection probability
+        dark_rate_hz: Detector dark count rate
+        custom_error_rate: Intrinsic error probability on basis match
+        window_ns: Detection window in nanoseconds
+        basis_prob: Probability of rectilinear basis when num_bases == 2
+        draws, fallback_bits: Random inputs from _measurement_draws
+        
+    Returns:
+        Tuple of (bob_bits, bob_basis_codes, valid) arrays
+        
+    Photons are independent, so the loop runs across cores with prange. All randomness
+    comes in pre-drawn from the simulator's seeded generator, so results are reproducible.
+    """
+    n = photon_bits.shape[0]
+    bob_bits = np.zeros(n, dtype=np.int8)
+    bob_bases = np.zeros(n, dtype=np.int8)
+    valid = np.zeros(n, dtype=np.bool_)
+    dark_count_prob = dark_rate_hz * window_ns * 1e-9
+    
+    for i in prange(n):
+        # Bob chooses measurement basis (4th basis is the extended rectilinear one)
+        if num_bases == 2:
+            bob_basis = 0 if draws[0, i] < basis_prob else 1
+        else:
+            bob_basis = int(draws[0, i] * num_bases)
+            if bob_basis == 3:
+                bob_basis = 0
+        bob_bases[i] = bob_basis
+        
+        # Photon not detected
+        if draws[1, i] > detection_prob:
+            continue
+        
+        # Dark count (Poisson approximated by Bernoulli at small expectation)
+        if draws[2, i] < dark_count_prob:
+            bob_bits[i] = fallback_bits[i]
+            continue
+        
+        if bob_basis == photon_bases[i]:
+            # Branchless error application: flip Alice's bit with probability error_prob
+            error_prob = custom_error_rate + 0.02 * corrupted[i]
+            bob_bits[i] = photon_bits[i] ^ (draws[3, i] <= error_prob)
+        else:
+            bob_bits[i] = fallback_bits[i]
+        valid[i] = True
+    
+    return bob_bits, bob_bases, valid
+
+def _measure_photons_vectorized(photon_bits, photon_bases, corrupted, num_bases, detection_prob,
+                                dark_rate_hz, custom_error_rate, window_ns, basis_prob, draws, fallback_bits):
+    """
+    NumPy counterpart of measure_photons_batch used when numba is unavailable
+    
+    The per-photon decisions are combined with masks. Arguments and return value match
+    measure_photons_batch, and the same draws give the same result.
+    """
+    basis_draws, detection_draws, dark_draws, error_draws = draws
+    if num_bases == 2:
+        bob_bases = (basis_draws >= basis_prob).astype(np.int8)
+    else:
+        bob_bases = (basis_draws * num_bases).astype(np.int8)
+        bob_bases[bob_bases == 3] = 0
+    
+    detected = detection_draws <= detection_prob
+    dark = detected & (dark_draws < dark_rate_hz * window_ns * 1e-9)
+    valid = detected & ~dark
+    
+    # Matching basis: keep Alice's bit unless an error occurs; otherwise a random outcome
+    error_prob = custom_error_rate + 0.02 * corrupted
+    measured = np.where(error_draws > error_prob, photon_bits, 1 - photon_bits).astype(np.int8)
+    bob_bits = np.where(valid & (bob_bases == photon_bases), measured, fallback_bits)
+    bob_bits[~detected] = 0
+    
+    return bob_bits, bob_bases, valid
+
+# Temperature-induced decoherence at room temperature (295 K), Boltzmann/Planck factor
+_THERMAL_DECOHERENCE_HZ = (1.38e-23 * 295.0) / (6.626e-34) * 1e-9
+
+def _run_batch_simulation(job: Tuple['BB84LabSimulator', int]) -> Dict[str, Any]:
+    """Worker entry point for run_simulation_batch (must be module-level to pickle)"""
+    simulator, num_photons = job
+    return simulator.run_simulation(num_photons)
+
 class BB84LabSimulator:
     """Advanced BB84 Lab Simulator with comprehensive parameter modeling"""
     
-    def __init__(self):
+    def __init__(self, seed: int = None):
         self.reset_parameters()
         self.logger = logging.getLogger(__name__)
         self.current_protocol_variant = 'bb84'  # Track current protocol
+        # Per-simulator PCG64 stream; the SeedSequence is kept so batch workers get independent children
+        self._seed_seq = np.random.SeedSequence(seed) if NUMPY_AVAILABLE else None
+        self._np_rng = np.random.default_rng(self._seed_seq) if NUMPY_AVAILABLE else None
+        # Scalar draws for the per-photon paths come from the same stream (seeded random.Random without NumPy)
+        self._draws = _BulkDraws(self._np_rng) if NUMPY_AVAILABLE else random.Random(seed)
+        self._dark_count_fn = self._dark_count_numpy if NUMPY_AVAILABLE else self._dark_count_fallback
         
     def reset_parameters(self):
         """Reset all simulation parameters to research-backed defaults"""
@@ -72,8 +302,20 @@ class BB84LabSimulator:
         self.photons_received = 0
         self.basis_matches = 0
         self.final_key_bits = 0
-        self.simulation_log = []
+        self.simulation_log = deque(maxlen=50)  # Keep last 50 entries
+        self._sim_start_time = None  # time.monotonic() start of the run driven by /api/lab/simulation_status
         
+    @property
+    def polarization_drift_degrees(self) -> float:
+        """Polarization drift in degrees"""
+        return self._polarization_drift_degrees
+    
+    @polarization_drift_degrees.setter
+    def polarization_drift_degrees(self, value: float):
+        # Keep the drift-dependent decoherence term in sync for calculate_decoherence_rate
+        self._polarization_drift_degrees = value
+        self._polarization_decoherence_hz = (value / 90.0) * 1e5
+    
     def update_parameters(self, params: Dict[str, Any]):
         """Update simulation parameters"""
         if 'photon_rate' in params:
@@ -112,57 +354,65 @@ class BB84LabSimulator:
     
     def simulate_polarization_drift(self, photon: QuantumPhoton) -> QuantumPhoton:
         """Apply polarization drift to photon"""
-        drift = random.uniform(-self.polarization_drift_degrees, self.polarization_drift_degrees)
+        drift = self._draws.uniform(-self.polarization_drift_degrees, self.polarization_drift_degrees)
         photon.polarization += drift
         return photon
     
     def simulate_dark_counts(self, detection_window_seconds: float) -> int:
         """Simulate dark counts during detection window"""
+        return self._dark_count_fn(detection_window_seconds)
+    
+    def _dark_count_numpy(self, detection_window_seconds: float) -> int:
+        """Poisson-sampled dark counts using NumPy"""
         expected_dark_counts = self.dark_count_rate_hz * detection_window_seconds
         if expected_dark_counts > 0:
-            if NUMPY_AVAILABLE:
-                return np.random.poisson(expected_dark_counts)
-            else:
-                # Simple approximation for Poisson distribution
-                return max(0, int(expected_dark_counts + random.gauss(0, math.sqrt(expected_dark_counts))))
+            return self._np_rng.poisson(expected_dark_counts)
+        return 0
+    
+    def _dark_count_fallback(self, detection_window_seconds: float) -> int:
+        """Gaussian approximation of Poisson dark counts when NumPy is unavailable"""
+        expected_dark_counts = self.dark_count_rate_hz * detection_window_seconds
+        if expected_dark_counts > 0:
+            return max(0, int(expected_dark_counts + random.gauss(0, math.sqrt(expected_dark_counts))))
         return 0
     
     def simulate_eve_attack(self, photon: QuantumPhoton) -> QuantumPhoton:
         """Simulate Eve's attack on the photon"""
-        if random.random() > self.eve_interception_rate:
+        if self._draws.random() > self.eve_interception_rate:
             return photon  # Eve doesn't intercept
             
         # Eve intercepts the photon
         if self.attack_strategy == AttackType.INTERCEPT_RESEND:
             # Eve measures in random basis and resends
-            eve_basis = Basis.RECTILINEAR if random.random() < 0.5 else Basis.DIAGONAL
+            eve_basis = Basis.RECTILINEAR if self._draws.random() < 0.5 else Basis.DIAGONAL
             if eve_basis != photon.basis:
                 # Wrong basis measurement - 50% chance of error
-                if random.random() < 0.5:
+                if self._draws.random() < 0.5:
                     photon.bit_value = 1 - photon.bit_value
                 photon.corrupted = True
                     
         elif self.attack_strategy == AttackType.BEAM_SPLITTING:
             # Eve splits the beam - reduces photon intensity
-            if random.random() < 0.5:  # 50% chance photon is lost
+            if self._draws.random() < 0.5:  # 50% chance photon is lost
                 photon.detected = False
                 photon.corrupted = True
                 
         elif self.attack_strategy == AttackType.PHOTON_NUMBER_SPLITTING:
             # Multi-photon attack - more complex
-            if random.random() < 0.3:  # 30% chance of successful PNS attack
+            if self._draws.random() < 0.3:  # 30% chance of successful PNS attack
                 photon.corrupted = True
                 
         elif self.attack_strategy == AttackType.TROJAN_HORSE:
             # Trojan horse attack - detector blinding
-            if random.random() < 0.2:  # 20% chance of detector compromise
+            if self._draws.random() < 0.2:  # 20% chance of detector compromise
                 photon.corrupted = True
                 
         return photon
     
-    def alice_prepares_photon(self) -> QuantumPhoton:
+    def alice_prepares_photon(self, bit_value: int = None) -> QuantumPhoton:
         """Alice prepares a quantum photon based on current protocol variant"""
-        bit_value = random.randint(0, 1)
+        if bit_value is None:
+            bit_value = self._draws.randint(0, 1)
         
         if self.current_protocol_variant == 'decoy':
             return self._prepare_decoy_state_photon(bit_value)
@@ -173,14 +423,14 @@ class BB84LabSimulator:
         elif self.current_protocol_variant == 'custom':
             return self._prepare_custom_photon(bit_value)
         else:  # Standard BB84
-            basis = Basis.RECTILINEAR if random.random() < self.basis_selection_prob else Basis.DIAGONAL
+            basis = Basis.RECTILINEAR if self._draws.random() < self.basis_selection_prob else Basis.DIAGONAL
             
             # Add slight polarization imperfection
             base_polarization = 0 if bit_value == 0 else 90
             if basis == Basis.DIAGONAL:
                 base_polarization += 45
                 
-            polarization = base_polarization + random.uniform(-0.5, 0.5)
+            polarization = base_polarization + self._draws.uniform(-0.5, 0.5)
             
             return QuantumPhoton(bit_value, basis, polarization)
     
@@ -195,33 +445,64 @@ class BB84LabSimulator:
             return self._measure_six_state_photon(photon)
         elif self.current_protocol_variant == 'custom':
             return self._measure_custom_photon(photon)
+        elif not NUMPY_AVAILABLE:
+            return self._measure_bb84_photon(photon)
+        else:  # Standard BB84: a batch of one through the shared measurement kernel
+            bits, bases, valid = self.measure_photons([photon.bit_value], [photon.basis], [photon.corrupted])
+            return int(bits[0]), _BASES_BY_CODE[bases[0]], bool(valid[0])
+    
+    def measure_photons(self, photon_bits, photon_bases, corrupted) -> Tuple[Any, Any, Any]:
+        """Batch counterpart of bob_measures_photon for the standard BB84 and custom variants"""
+        if self.current_protocol_variant == 'custom':
+            bases_count = getattr(self, 'custom_bases_count', 2)
+            num_bases = bases_count if bases_count in (2, 3) else 4
+            error_rate = getattr(self, 'custom_error_rate', 0.01)
+            basis_prob = 0.5
         else:  # Standard BB84
-            # Bob randomly chooses measurement basis
-            bob_basis = Basis.RECTILINEAR if random.random() < self.basis_selection_prob else Basis.DIAGONAL
-            
-            # Apply detection probability
-            detection_prob = self.calculate_detection_probability()
-            if random.random() > detection_prob:
-                return 0, bob_basis, False  # Photon not detected, default bit value 0
-                
-            # Check for dark counts
-            detection_window = 1e-9  # 1 nanosecond window
-            dark_counts = self.simulate_dark_counts(detection_window)
-            if dark_counts > 0:
-                # Dark count detected instead of signal
-                measured_bit = random.randint(0, 1)
-                return measured_bit, bob_basis, False
-            
-            # Measure photon
-            if bob_basis == photon.basis:
-                # Correct basis - should get correct bit (with small error probability)
-                error_prob = 0.01 + (0.02 if photon.corrupted else 0)
-                measured_bit = photon.bit_value if random.random() > error_prob else (1 - photon.bit_value)
-                return measured_bit, bob_basis, True
-            else:
-                # Wrong basis - random result
-                measured_bit = random.randint(0, 1)
-                return measured_bit, bob_basis, True
+            num_bases = 2
+            error_rate = 0.01
+            basis_prob = self.basis_selection_prob
+        
+        # Contiguous int8/bool inputs let the kernels vectorize the per-photon loop
+        photon_bits = np.ascontiguousarray(photon_bits, dtype=np.int8)
+        photon_bases = np.ascontiguousarray(photon_bases, dtype=np.int8)
+        corrupted = np.ascontiguousarray(corrupted, dtype=np.bool_)
+        draws, fallback_bits = _measurement_draws(self._np_rng, photon_bits.shape[0])
+        args = (photon_bits, photon_bases, corrupted, num_bases,
+                self.calculate_detection_probability(), self.dark_count_rate_hz,
+                error_rate, 1.0, basis_prob, draws, fallback_bits)
+        if NUMBA_AVAILABLE:
+            return measure_photons_batch(*args)
+        return _measure_photons_vectorized(*args)
+    
+    def _measure_bb84_photon(self, photon: QuantumPhoton) -> Tuple[int, Basis, bool]:
+        """Scalar standard BB84 measurement used when NumPy is unavailable"""
+        # Bob randomly chooses measurement basis
+        bob_basis = Basis.RECTILINEAR if self._draws.random() < self.basis_selection_prob else Basis.DIAGONAL
+
+        # Apply detection probability
+        detection_prob = self.calculate_detection_probability()
+        if self._draws.random() > detection_prob:
+            return 0, bob_basis, False  # Photon not detected, default bit value 0
+
+        # Check for dark counts
+        detection_window = 1e-9  # 1 nanosecond window
+        dark_counts = self.simulate_dark_counts(detection_window)
+        if dark_counts > 0:
+            # Dark count detected instead of signal
+            measured_bit = self._draws.randint(0, 1)
+            return measured_bit, bob_basis, False
+
+        # Measure photon
+        if bob_basis == photon.basis:
+            # Correct basis - should get correct bit (with small error probability)
+            error_prob = 0.01 + (0.02 if photon.corrupted else 0)
+            measured_bit = photon.bit_value if self._draws.random() > error_prob else (1 - photon.bit_value)
+            return measured_bit, bob_basis, True
+        else:
+            # Wrong basis - random result
+            measured_bit = self._draws.randint(0, 1)
+            return measured_bit, bob_basis, True
     
     def calculate_qber(self, sifted_key_alice: List[int], sifted_key_bob: List[int]) -> float:
         """Calculate Quantum Bit Error Rate"""
@@ -248,8 +529,6 @@ class BB84LabSimulator:
         timestamp = time.strftime("%H:%M:%S")
         log_entry = f"[{timestamp}] {message}"
         self.simulation_log.append(log_entry)
-        if len(self.simulation_log) > 50:  # Keep last 50 entries
-            self.simulation_log.pop(0)
     
     def run_simulation(self, num_photons: int = 10000) -> Dict[str, Any]:
         """Run the complete BB84 simulation"""
@@ -259,36 +538,62 @@ class BB84LabSimulator:
         self.photons_received = 0
         self.basis_matches = 0
         self.final_key_bits = 0
-        self.simulation_log = []
+        self.simulation_log.clear()
         
-        protocol_name = {
-            'bb84': 'Standard BB84',
-            'decoy': 'Decoy State BB84', 
-            'sarg04': 'SARG04 Protocol',
-            'six-state': 'Six-State BB84',
-            'custom': 'Custom BB84'
-        }.get(self.current_protocol_variant, 'BB84')
+        protocol_name = PROTOCOL_NAMES.get(self.current_protocol_variant, 'BB84')
         
         self.log_message(f"Starting {protocol_name} simulation with {num_photons} photons")
         self.log_message(f"Protocol variant: {protocol_name}")
         self.log_message(f"Channel loss: {self.channel_loss_db} dB, Eve's interception: {self.eve_interception_rate*100:.1f}%")
         self.log_message(f"Attack strategy: {self.attack_strategy.value}")
         
-        # Alice's random bits and bases
-        alice_bits = []
-        alice_bases = []
-        bob_bits = []
-        bob_bases = []
-        detected_photons = []
+        # Alice's random bits and bases as parallel arrays (preallocated; Bob's side truncated after transmission)
+        if NUMPY_AVAILABLE:
+            alice_bits = np.empty(num_photons, dtype=np.uint8)
+            alice_bases = np.empty(num_photons, dtype=np.int8)
+            bob_bits = np.empty(num_photons, dtype=np.uint8)
+            bob_bases = np.empty(num_photons, dtype=np.int8)
+            detected_photons = np.empty(num_photons, dtype=np.int64)
+        else:
+            alice_bits = [0] * num_photons
+            alice_bases = [None] * num_photons
+            bob_bits = [0] * num_photons
+            bob_bases = [None] * num_photons
+            detected_photons = [0] * num_photons
+        
+        # Draw the per-photon coin flips and channel draws up front: each byte from
+        # bytes() unpacks into 8 fair bits, consumed consecutively (2 per photon)
+        if NUMPY_AVAILABLE:
+            coin_bits = np.unpackbits(
+                np.frombuffer(self._np_rng.bytes((2 * num_photons + 7) // 8), dtype=np.uint8),
+                count=2 * num_photons
+            ).reshape(2, num_photons)
+            alice_coins = coin_bits[0].tolist()
+            loss_coins = coin_bits[1].tolist()
+            channel_draws = self._np_rng.random(num_photons, dtype=np.float32).tolist()
+        else:
+            alice_coins = [random.randint(0, 1) for _ in range(num_photons)]
+            loss_coins = [random.randint(0, 1) for _ in range(num_photons)]
+            channel_draws = [random.random() for _ in range(num_photons)]
+        channel_transmission = self.calculate_channel_transmission()
+        
+        # Standard BB84 and custom variants measure all transmitted photons in one batch
+        batch_measure = NUMPY_AVAILABLE and self.current_protocol_variant in ('bb84', 'custom')
+        if batch_measure:
+            tx_bits = np.empty(num_photons, dtype=np.int8)
+            tx_bases = np.empty(num_photons, dtype=np.int8)
+            tx_corrupted = np.empty(num_photons, dtype=np.bool_)
+            tx_index = np.empty(num_photons, dtype=np.int64)
+            tx_count = 0
         
         # Quantum transmission phase
         for i in range(num_photons):
             self.progress = (i / num_photons) * 50  # First 50% for transmission
             
             # Alice prepares photon
-            photon = self.alice_prepares_photon()
-            alice_bits.append(photon.bit_value)
-            alice_bases.append(photon.basis)
+            photon = self.alice_prepares_photon(alice_coins[i])
+            alice_bits[i] = photon.bit_value
+            alice_bases[i] = photon.basis
             
             # Apply polarization drift
             photon = self.simulate_polarization_drift(photon)
@@ -297,32 +602,68 @@ class BB84LabSimulator:
             photon = self.simulate_eve_attack(photon)
             
             # Channel transmission
-            if random.random() < self.calculate_channel_transmission() and not (photon.corrupted and random.random() < 0.5):
+            if channel_draws[i] < channel_transmission and not (photon.corrupted and loss_coins[i]):
+                if batch_measure:
+                    # Queue photon for batched measurement after transmission
+                    tx_bits[tx_count] = photon.bit_value
+                    tx_bases[tx_count] = photon.basis
+                    tx_corrupted[tx_count] = photon.corrupted
+                    tx_index[tx_count] = i
+                    tx_count += 1
+                    self.photons_sent += 1
+                    continue
+                
                 # Bob measures photon
                 measured_bit, bob_basis, detected = self.bob_measures_photon(photon)
                 if detected and measured_bit is not None:
-                    bob_bits.append(measured_bit)
-                    bob_bases.append(bob_basis)
-                    detected_photons.append(i)
+                    received = self.photons_received
+                    bob_bits[received] = measured_bit
+                    bob_bases[received] = bob_basis
+                    detected_photons[received] = i
                     self.photons_received += 1
             
             self.photons_sent += 1
             
-            if i % 1000 == 0:
+            if not batch_measure and i % 1000 == 0:
                 self.log_message(f"Transmitted {i} photons, {self.photons_received} detected")
         
+        if batch_measure:
+            measured_bits, measured_bases, valid = self.measure_photons(
+                tx_bits[:tx_count], tx_bases[:tx_count], tx_corrupted[:tx_count]
+            )
+            detected_index = tx_index[:tx_count][valid]
+            received = detected_index.size
+            bob_bits[:received] = measured_bits[valid]
+            bob_bases[:received] = measured_bases[valid]
+            detected_photons[:received] = detected_index
+            self.photons_received = received
+            
+            for i in range(0, num_photons, 1000):
+                detected_so_far = int(np.searchsorted(detected_index, i, side='right'))
+                self.log_message(f"Transmitted {i} photons, {detected_so_far} detected")
+        
         self.log_message(f"Quantum transmission complete: {self.photons_received}/{num_photons} photons detected")
         
+        bob_bits = bob_bits[:self.photons_received]
+        bob_bases = bob_bases[:self.photons_received]
+        detected_photons = detected_photons[:self.photons_received]
+        
         # Basis reconciliation phase
         self.progress = 60
-        sifted_key_alice = []
-        sifted_key_bob = []
-        
-        for i, photon_idx in enumerate(detected_photons):
-            if alice_bases[photon_idx] == bob_bases[i]:  # Matching bases
-                sifted_key_alice.append(alice_bits[photon_idx])
-                sifted_key_bob.append(bob_bits[i])
-                self.basis_matches += 1
+        if NUMPY_AVAILABLE:
+            basis_match = alice_bases[detected_photons] == bob_bases  # Matching bases
+            sifted_key_alice = alice_bits[detected_photons][basis_match].tolist()
+            sifted_key_bob = bob_bits[basis_match].tolist()
+            self.basis_matches += len(sifted_key_alice)
+        else:
+            sifted_key_alice = []
+            sifted_key_bob = []
+            
+            for i, photon_idx in enumerate(detected_photons):
+                if alice_bases[photon_idx] == bob_bases[i]:  # Matching bases
+                    sifted_key_alice.append(alice_bits[photon_idx])
+                    sifted_key_bob.append(bob_bits[i])
+                    self.basis_matches += 1
         
         self.log_message(f"Basis reconciliation: {self.basis_matches} matching bases")
         
@@ -360,10 +701,44 @@ class BB84LabSimulator:
             'basis_match_rate': basis_match_rate,
             'key_rate_kbps': key_rate_kbps,
             'security_threshold_met': qber <= self.qber_threshold_percent / 100.0,
-            'simulation_log': self.simulation_log.copy(),
+            'simulation_log': list(self.simulation_log),
             'progress': self.progress
         }
     
+    def run_simulation_batch(self, param_grid: List[Dict[str, Any]], num_photons: int = 10000,
+                             workers: int = None) -> List[Dict[str, Any]]:
+        """
+        Run independent simulations for a parameter sweep in parallel worker processes
+
+        Args:
+            param_grid: List of parameter dicts (same keys as update_parameters)
+            num_photons: Photons transmitted per simulation
+            workers: Number of worker processes (default: CPU count)
+
+        Returns:
+            List of simulation results in the same order as param_grid
+        """
+        # Each job gets its own deep-copied simulator so no state is shared between runs
+        jobs = []
+        child_seeds = self._seed_seq.spawn(len(param_grid)) if NUMPY_AVAILABLE else [None] * len(param_grid)
+        for params, child_seed in zip(param_grid, child_seeds):
+            simulator = copy.deepcopy(self)
+            if child_seed is not None:
+                # Deep copies would otherwise replay the same random stream
+                simulator._seed_seq = child_seed
+                simulator._np_rng = np.random.default_rng(child_seed)
+                simulator._draws = _BulkDraws(simulator._np_rng)
+            simulator.update_parameters(params)
+            jobs.append((simulator, num_photons))
+
+        if not jobs:
+            return []
+
+        # Spawn rather than fork: forking after numba's threading layer has started can deadlock
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            return list(pool.map(_run_batch_simulation, jobs))
+
     def get_simulation_status(self) -> Dict[str, Any]:
         """Get current simulation status"""
         return {
@@ -373,7 +748,7 @@ class BB84LabSimulator:
             'photons_received': self.photons_received,
             'basis_matches': self.basis_matches,
             'final_key_bits': self.final_key_bits,
-            'log_entries': self.simulation_log[-10:] if len(self.simulation_log) > 10 else self.simulation_log
+            'log_entries': list(self.simulation_log)[-10:]
         }
     
     def stop_simulation(self):
@@ -386,7 +761,7 @@ class BB84LabSimulator:
     def _prepare_decoy_state_photon(self, bit_value: int) -> QuantumPhoton:
         """Prepare a decoy state photon with multiple intensity levels"""
         # 2024 optimized decoy state ratios (ETASR Journal)
-        intensity_rand = random.random()
+        intensity_rand = self._draws.random()
         if intensity_rand < 0.95:   # 95% signal pulses (2024 optimization)
             intensity = 'signal'
         elif intensity_rand < 0.99: # 4% decoy pulses  
@@ -396,7 +771,7 @@ class BB84LabSimulator:
             bit_value = 0  # Vacuum state always corresponds to no photon
         
         # Choose basis randomly
-        basis = Basis.RECTILINEAR if random.random() < 0.5 else Basis.DIAGONAL
+        basis = Basis.RECTILINEAR if self._draws.random() < 0.5 else Basis.DIAGONAL
         
         # Set polarization based on bit and basis
         base_polarization = 0 if bit_value == 0 else 90
@@ -405,7 +780,7 @@ class BB84LabSimulator:
             
         # Add intensity-dependent noise
         noise_level = 0.5 if intensity == 'signal' else (0.8 if intensity == 'decoy' else 1.5)
-        polarization = base_polarization + random.uniform(-noise_level, noise_level)
+        polarization = base_polarization + self._draws.uniform(-noise_level, noise_level)
         
         photon = QuantumPhoton(bit_value, basis, polarization, intensity)
         return photon
@@ -416,7 +791,7 @@ class BB84LabSimulator:
         # But encoding is different from BB84
         
         # Choose one of four SARG04 states
-        state_choice = random.randint(0, 3)
+        state_choice = self._draws.randint(0, 3)
         
         if state_choice == 0:  # |0⟩ rectilinear
             basis = Basis.RECTILINEAR
@@ -444,7 +819,7 @@ class BB84LabSimulator:
             # For diagonal preparation, bit determined by rectilinear measurement outcome
             actual_bit = bit_value  # Use intended bit
         
-        polarization += random.uniform(-0.3, 0.3)  # Small imperfection
+        polarization += self._draws.uniform(-0.3, 0.3)  # Small imperfection
         
         photon = QuantumPhoton(actual_bit, basis, polarization)
         photon.sarg04_state = sarg04_state
@@ -453,7 +828,7 @@ class BB84LabSimulator:
     def _prepare_six_state_photon(self, bit_value: int) -> QuantumPhoton:
         """Prepare a six-state protocol photon using three measurement bases"""
         # Six-state protocol uses rectilinear, diagonal, and circular bases
-        basis_choice = random.randint(0, 2)
+        basis_choice = self._draws.randint(0, 2)
         
         if basis_choice == 0:  # Rectilinear basis
             basis = Basis.RECTILINEAR
@@ -466,7 +841,7 @@ class BB84LabSimulator:
             # Circular polarization: left (0) or right (1)
             base_polarization = 0 if bit_value == 0 else 180  # Simplified representation
         
-        polarization = base_polarization + random.uniform(-0.4, 0.4)
+        polarization = base_polarization + self._draws.uniform(-0.4, 0.4)
         
         photon = QuantumPhoton(bit_value, basis, polarization)
         return photon
@@ -480,13 +855,13 @@ class BB84LabSimulator:
         
         if custom_bases_count == 2:
             # Standard two-basis selection
-            basis = Basis.RECTILINEAR if random.random() < custom_basis_prob else Basis.DIAGONAL
+            basis = Basis.RECTILINEAR if self._draws.random() < custom_basis_prob else Basis.DIAGONAL
             base_polarization = 0 if bit_value == 0 else 90
             if basis == Basis.DIAGONAL:
                 base_polarization += 45
         elif custom_bases_count == 3:
             # Three-basis selection (like six-state)
-            basis_choice = random.randint(0, 2)
+            basis_choice = self._draws.randint(0, 2)
             if basis_choice == 0:
                 basis = Basis.RECTILINEAR
                 base_polarization = 0 if bit_value == 0 else 90
@@ -497,7 +872,7 @@ class BB84LabSimulator:
                 basis = Basis.CIRCULAR
                 base_polarization = 0 if bit_value == 0 else 180
         else:  # custom_bases_count == 4 (extended basis set)
-            basis_choice = random.randint(0, 3)
+            basis_choice = self._draws.randint(0, 3)
             if basis_choice == 0:
                 basis = Basis.RECTILINEAR
                 base_polarization = 0 if bit_value == 0 else 90
@@ -511,7 +886,7 @@ class BB84LabSimulator:
                 basis = Basis.RECTILINEAR  # Extended rectilinear
                 base_polarization = 30 if bit_value == 0 else 120
         
-        polarization = base_polarization + random.uniform(-custom_noise_level, custom_noise_level)
+        polarization = base_polarization + self._draws.uniform(-custom_noise_level, custom_noise_level)
         
         photon = QuantumPhoton(bit_value, basis, polarization)
         return photon
@@ -521,7 +896,7 @@ class BB84LabSimulator:
     def _measure_decoy_state_photon(self, photon: QuantumPhoton) -> Tuple[int, Basis, bool]:
         """Measure decoy state photon with intensity-dependent detection"""
         # Bob randomly chooses measurement basis
-        bob_basis = Basis.RECTILINEAR if random.random() < 0.5 else Basis.DIAGONAL
+        bob_basis = Basis.RECTILINEAR if self._draws.random() < 0.5 else Basis.DIAGONAL
         
         # Intensity-dependent detection probability
         base_detection_prob = self.calculate_detection_probability()
@@ -532,7 +907,7 @@ class BB84LabSimulator:
         else:  # vacuum
             detection_prob = base_detection_prob * 0.1  # Very low for vacuum
         
-        if random.random() > detection_prob:
+        if self._draws.random() > detection_prob:
             return 0, bob_basis, False
         
         # Dark count check
@@ -540,7 +915,7 @@ class BB84LabSimulator:
         dark_counts = self.simulate_dark_counts(detection_window)
         if dark_counts > 0 and photon.intensity == 'vacuum':
             # Vacuum state with dark count
-            return random.randint(0, 1), bob_basis, False
+            return self._draws.randint(0, 1), bob_basis, False
         
         # Measure photon
         if bob_basis == photon.basis:
@@ -551,10 +926,10 @@ class BB84LabSimulator:
             elif photon.intensity == 'vacuum':
                 error_prob += 0.05
                 
-            measured_bit = photon.bit_value if random.random() > error_prob else (1 - photon.bit_value)
+            measured_bit = photon.bit_value if self._draws.random() > error_prob else (1 - photon.bit_value)
             return measured_bit, bob_basis, True
         else:
-            return random.randint(0, 1), bob_basis, True
+            return self._draws.randint(0, 1), bob_basis, True
     
     def _measure_sarg04_photon(self, photon: QuantumPhoton) -> Tuple[int, Basis, bool]:
         """Measure SARG04 photon using complementary basis strategy"""
@@ -562,66 +937,59 @@ class BB84LabSimulator:
         # This is the key difference from BB84
         
         # Bob chooses measurement basis randomly
-        bob_basis = Basis.RECTILINEAR if random.random() < 0.5 else Basis.DIAGONAL
+        bob_basis = Basis.RECTILINEAR if self._draws.random() < 0.5 else Basis.DIAGONAL
         
         # Apply detection probability
         detection_prob = self.calculate_detection_probability()
-        if random.random() > detection_prob:
+        if self._draws.random() > detection_prob:
             return 0, bob_basis, False
             
         # Dark count check
         detection_window = 1e-9
         dark_counts = self.simulate_dark_counts(detection_window)
         if dark_counts > 0:
-            return random.randint(0, 1), bob_basis, False
+            return self._draws.randint(0, 1), bob_basis, False
         
         # SARG04 measurement logic
         if bob_basis == photon.basis:
             # Same basis measurement - gives preparation state info
             error_prob = 0.01 + (0.02 if photon.corrupted else 0)
-            measured_bit = photon.bit_value if random.random() > error_prob else (1 - photon.bit_value)
+            measured_bit = photon.bit_value if self._draws.random() > error_prob else (1 - photon.bit_value)
         else:
             # Complementary basis measurement - this determines the key bit in SARG04
             # The key difference: complementary measurement determines bit value
             if photon.basis == Basis.RECTILINEAR and bob_basis == Basis.DIAGONAL:
                 # Rectilinear -> Diagonal: |0⟩,|1⟩ -> random outcome
-                measured_bit = random.randint(0, 1)
+                measured_bit = self._draws.randint(0, 1)
             elif photon.basis == Basis.DIAGONAL and bob_basis == Basis.RECTILINEAR:
                 # Diagonal -> Rectilinear: |+⟩,|-⟩ -> random outcome  
-                measured_bit = random.randint(0, 1)
+                measured_bit = self._draws.randint(0, 1)
             else:
-                measured_bit = random.randint(0, 1)
+                measured_bit = self._draws.randint(0, 1)
         
         return measured_bit, bob_basis, True
     
     def _measure_six_state_photon(self, photon: QuantumPhoton) -> Tuple[int, Basis, bool]:
         """Measure six-state photon using one of three bases"""
         # Bob randomly chooses one of three measurement bases
-        basis_choice = random.randint(0, 2)
-        
-        if basis_choice == 0:
-            bob_basis = Basis.RECTILINEAR
-        elif basis_choice == 1:
-            bob_basis = Basis.DIAGONAL
-        else:
-            bob_basis = Basis.CIRCULAR
+        bob_basis = _BASES_BY_CODE[self._draws.randint(0, 2)]
         
         # Apply detection probability
         detection_prob = self.calculate_detection_probability()
-        if random.random() > detection_prob:
+        if self._draws.random() > detection_prob:
             return 0, bob_basis, False
             
         # Dark count check
         detection_window = 1e-9
         dark_counts = self.simulate_dark_counts(detection_window)
         if dark_counts > 0:
-            return random.randint(0, 1), bob_basis, False
+            return self._draws.randint(0, 1), bob_basis, False
         
         # Six-state measurement
         if bob_basis == photon.basis:
             # Correct basis - reliable measurement
             error_prob = 0.01 + (0.02 if photon.corrupted else 0)
-            measured_bit = photon.bit_value if random.random() > error_prob else (1 - photon.bit_value)
+            measured_bit = photon.bit_value if self._draws.random() > error_prob else (1 - photon.bit_value)
             return measured_bit, bob_basis, True
         else:
             # Wrong basis - random result with higher error rate
@@ -629,12 +997,12 @@ class BB84LabSimulator:
             if (bob_basis == Basis.RECTILINEAR and photon.basis == Basis.DIAGONAL) or \
                (bob_basis == Basis.DIAGONAL and photon.basis == Basis.RECTILINEAR):
                 # Rectilinear-Diagonal cross measurements
-                measured_bit = random.randint(0, 1)
+                measured_bit = self._draws.randint(0, 1)
             elif bob_basis == Basis.CIRCULAR or photon.basis == Basis.CIRCULAR:
                 # Circular basis involved - different cross-measurement statistics
-                measured_bit = random.randint(0, 1)
+                measured_bit = self._draws.randint(0, 1)
             else:
-                measured_bit = random.randint(0, 1)
+                measured_bit = self._draws.randint(0, 1)
             
             return measured_bit, bob_basis, True
     
@@ -645,44 +1013,30 @@ class BB84LabSimulator:
         
         # Bob chooses measurement basis based on custom protocol
         if custom_bases_count == 2:
-            bob_basis = Basis.RECTILINEAR if random.random() < 0.5 else Basis.DIAGONAL
+            bob_basis = Basis.RECTILINEAR if self._draws.random() < 0.5 else Basis.DIAGONAL
         elif custom_bases_count == 3:
-            basis_choice = random.randint(0, 2)
-            if basis_choice == 0:
-                bob_basis = Basis.RECTILINEAR
-            elif basis_choice == 1:
-                bob_basis = Basis.DIAGONAL
-            else:
-                bob_basis = Basis.CIRCULAR
+            bob_basis = _BASES_BY_CODE[self._draws.randint(0, 2)]
         else:  # 4 bases
-            basis_choice = random.randint(0, 3)
-            if basis_choice == 0:
-                bob_basis = Basis.RECTILINEAR
-            elif basis_choice == 1:
-                bob_basis = Basis.DIAGONAL
-            elif basis_choice == 2:
-                bob_basis = Basis.CIRCULAR
-            else:
-                bob_basis = Basis.RECTILINEAR  # Extended
+            bob_basis = _BASES_BY_CHOICE_4[self._draws.randint(0, 3)]
         
         # Apply detection probability
         detection_prob = self.calculate_detection_probability()
-        if random.random() > detection_prob:
+        if self._draws.random() > detection_prob:
             return 0, bob_basis, False
             
         # Dark count check
         detection_window = 1e-9
         dark_counts = self.simulate_dark_counts(detection_window)
         if dark_counts > 0:
-            return random.randint(0, 1), bob_basis, False
+            return self._draws.randint(0, 1), bob_basis, False
         
         # Custom measurement with configurable error rate
         if bob_basis == photon.basis:
             error_prob = custom_error_rate + (0.02 if photon.corrupted else 0)
-            measured_bit = photon.bit_value if random.random() > error_prob else (1 - photon.bit_value)
+            measured_bit = photon.bit_value if self._draws.random() > error_prob else (1 - photon.bit_value)
             return measured_bit, bob_basis, True
         else:
-            return random.randint(0, 1), bob_basis, True
+            return self._draws.randint(0, 1), bob_basis, True
     
     def calculate_decoherence_rate(self, transmission_time_ns: float = 1000.0, channel_length_km: float = 10.0) -> float:
         """
@@ -695,36 +1049,45 @@ class BB84LabSimulator:
         Returns:
             Decoherence rate in Hz (events per second)
         """
-        # Base decoherence rate from environmental factors (2024 research values)
-        base_decoherence_hz = 1e6  # 1 MHz baseline for atmospheric transmission
-        
-        # Fiber optic decoherence (much lower than free-space)
-        fiber_decoherence_coefficient = 0.1  # Reduced decoherence in fiber
-        
-        # Temperature-induced decoherence (Kelvin to Hz conversion factor)
-        temperature_k = 295.0  # Room temperature
-        thermal_decoherence_hz = (1.38e-23 * temperature_k) / (6.626e-34) * 1e-9  # Boltzmann/Planck factor
-        
-        # Distance-dependent decoherence
-        distance_factor = 1 + (channel_length_km * 0.02)  # 2% increase per km
-        
-        # Polarization drift contribution
-        polarization_decoherence_hz = (self.polarization_drift_degrees / 90.0) * 1e5
-        
-        # Calculate total decoherence rate
+        # 1 MHz atmospheric baseline scaled by the 0.1 fiber coefficient, +2% per km;
+        # thermal and polarization terms are precomputed
         total_decoherence_hz = (
-            base_decoherence_hz * fiber_decoherence_coefficient * distance_factor +
-            thermal_decoherence_hz + 
-            polarization_decoherence_hz
+            1e5 * (1 + channel_length_km * 0.02) +
+            _THERMAL_DECOHERENCE_HZ +
+            self._polarization_decoherence_hz
         )
         
-        # Apply transmission time scaling
-        time_scaling = transmission_time_ns / 1000.0  # Normalize to microsecond
-        decoherence_rate_hz = total_decoherence_hz * time_scaling
+        # Apply transmission time scaling (normalize to microsecond)
+        decoherence_rate_hz = total_decoherence_hz * transmission_time_ns * 1e-3
         
         # Ensure reasonable bounds
         return max(1000.0, min(decoherence_rate_hz, 1e9))  # 1 kHz to 1 GHz range
     
+    @property
+    def _fidelity_scale(self) -> float:
+        """Product of the channel degradation factors, recomputed only when its inputs change"""
+        key = (self.channel_loss_db, self.detector_efficiency_percent,
+               self.polarization_drift_degrees, self.dark_count_rate_hz)
+        cached = getattr(self, '_fidelity_scale_cache', None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        # Apply quantum channel degradation factors
+        channel_transmission = self.calculate_channel_transmission()
+        detector_efficiency = self.detector_efficiency_percent / 100.0
+        
+        # Polarization drift impact on fidelity
+        polarization_fidelity = 1.0 - (self.polarization_drift_degrees / 180.0)  # Max 180° drift
+        
+        # Dark count noise impact
+        detection_window = 1e-9  # 1 nanosecond
+        expected_dark_counts = self.dark_count_rate_hz * detection_window
+        dark_count_fidelity = 1.0 / (1.0 + expected_dark_counts * 100)  # Noise degrades fidelity
+        
+        scale = channel_transmission * detector_efficiency * polarization_fidelity * dark_count_fidelity
+        self._fidelity_scale_cache = (key, scale)
+        return scale
+    
     def calculate_quantum_state_fidelity(self, alice_bits: List[int], bob_bits: List[int], 
                                        alice_bases: List[Basis], bob_bases: List[Basis]) -> float:
         """
@@ -739,47 +1102,41 @@ class BB84LabSimulator:
         Returns:
             Quantum state fidelity (0.0 to 1.0)
         """
-        if not alice_bits or not bob_bits:
+        if len(alice_bits) == 0 or len(bob_bits) == 0:
+            return 0.0
+        
+        # A zero degradation factor forces zero fidelity; skip the comparison entirely
+        fidelity_scale = self._fidelity_scale
+        if fidelity_scale == 0.0:
             return 0.0
             
         # Count matching measurements when bases are aligned
-        matching_basis_count = 0
-        correct_measurements = 0
-        
         min_length = min(len(alice_bits), len(bob_bits), len(alice_bases), len(bob_bases))
         
-        for i in range(min_length):
-            if alice_bases[i] == bob_bases[i]:  # Same basis measurements
-                matching_basis_count += 1
-                if alice_bits[i] == bob_bits[i]:  # Correct measurement result
-                    correct_measurements += 1
+        if NUMPY_AVAILABLE:
+            a_bases = _basis_code_array(alice_bases, min_length)
+            b_bases = _basis_code_array(bob_bases, min_length)
+            a_bits = np.asarray(alice_bits[:min_length], dtype=np.int8)
+            b_bits = np.asarray(bob_bits[:min_length], dtype=np.int8)
+            
+            basis_mask = a_bases == b_bases  # Same basis measurements
+            matching_basis_count = int(basis_mask.sum())
+            correct_measurements = int(((a_bits == b_bits) & basis_mask).sum())  # Correct measurement result
+        else:
+            matching_basis_count = 0
+            correct_measurements = 0
+            for i in range(min_length):
+                if alice_bases[i] == bob_bases[i]:  # Same basis measurements
+                    matching_basis_count += 1
+                    if alice_bits[i] == bob_bits[i]:  # Correct measurement result
+                        correct_measurements += 1
         
         if matching_basis_count == 0:
             return 0.0
             
-        # Base fidelity from measurement accuracy
+        # Base fidelity from measurement accuracy, scaled by the channel degradation factors
         measurement_fidelity = correct_measurements / matching_basis_count
-        
-        # Apply quantum channel degradation factors
-        channel_transmission = self.calculate_channel_transmission()
-        detector_efficiency = self.detector_efficiency_percent / 100.0
-        
-        # Polarization drift impact on fidelity
-        polarization_fidelity = 1.0 - (self.polarization_drift_degrees / 180.0)  # Max 180° drift
-        
-        # Dark count noise impact
-        detection_window = 1e-9  # 1 nanosecond
-        expected_dark_counts = self.dark_count_rate_hz * detection_window
-        dark_count_fidelity = 1.0 / (1.0 + expected_dark_counts * 100)  # Noise degrades fidelity
-        
-        # Calculate composite quantum state fidelity
-        quantum_fidelity = (
-            measurement_fidelity * 
-            channel_transmission * 
-            detector_efficiency * 
-            polarization_fidelity * 
-            dark_count_fidelity
-        )
+        quantum_fidelity = measurement_fidelity * fidelity_scale
         
         # Apply quantum coherence preservation (Bell state fidelity bounds)
         # For BB84, maximum theoretical fidelity is limited by no-cloning theorem
@@ -817,12 +1174,7 @@ class BB84LabSimulator:
         # Calculate information leaked to eavesdropper (Shannon entropy)
         if qber > 0 and qber < 0.5:
             # Binary entropy function H(p) = -p*log2(p) - (1-p)*log2(1-p)
-            if qber == 0:
-                h_qber = 0
-            elif qber == 1:
-                h_qber = 1
-            else:
-                h_qber = -qber * math.log2(qber) - (1 - qber) * math.log2(1 - qber)
+            h_qber = -qber * math.log2(qber) - (1 - qber) * math.log2(1 - qber)
             
             # Information leaked per sifted bit
             info_leaked_per_bit = h_qber
@@ -875,16 +1227,30 @@ class BB84LabSimulator:
         qber = simulation_result.get('qber', 0.0)
         distance = simulation_result.get('distance', 10.0)
         
-        # Convert string representations to lists if needed
+        # Convert string representations to arrays once, then use the typed entry point
         if isinstance(alice_bits, str):
-            alice_bits = [int(b) for b in alice_bits if b.isdigit()]
+            alice_bits = _parse_bit_string(alice_bits)
         if isinstance(bob_bits, str):
-            bob_bits = [int(b) for b in bob_bits if b.isdigit()]
+            bob_bits = _parse_bit_string(bob_bits)
         if isinstance(alice_bases, str):
-            alice_bases = [Basis.DIAGONAL if b == 'x' else Basis.RECTILINEAR for b in alice_bases]
+            alice_bases = _parse_basis_string(alice_bases)
         if isinstance(bob_bases, str):
-            bob_bases = [Basis.DIAGONAL if b == 'x' else Basis.RECTILINEAR for b in bob_bases]
+            bob_bases = _parse_basis_string(bob_bases)
+        
+        return self.compute_advanced_lab_metrics(
+            alice_bits, bob_bits, alice_bases, bob_bases,
+            len(sifted_key), len(final_key), qber, distance
+        )
+    
+    def compute_advanced_lab_metrics(self, alice_bits, bob_bits, alice_bases, bob_bases,
+                                     sifted_key_length: int, final_key_length: int,
+                                     qber: float, distance: float) -> Dict[str, Any]:
+        """
+        Advanced metrics from already-parsed sequences (bit arrays and Basis code arrays)
         
+        Callers holding arrays can use this directly and skip the string handling
+        in get_advanced_lab_metrics.
+        """
         # Calculate transmission time (speed of light in fiber: ~200,000 km/s)
         fiber_speed_km_ns = 200.0  # km per microsecond in fiber
         transmission_time_ns = (distance / fiber_speed_km_ns) * 1000.0  # Convert to nanoseconds
@@ -893,7 +1259,7 @@ class BB84LabSimulator:
         decoherence_rate = self.calculate_decoherence_rate(transmission_time_ns, distance)
         quantum_fidelity = self.calculate_quantum_state_fidelity(alice_bits, bob_bits, alice_bases, bob_bases)
         privacy_metrics = self.calculate_privacy_amplification_ratio(
-            len(sifted_key), len(final_key), qber
+            sifted_key_length, final_key_length, qber
         )
         
         # Additional derived metrics
@@ -924,6 +1290,6 @@ class BB84LabSimulator:
             'transmission_time_ns': round(transmission_time_ns, 2),
             'channel_quality_score': round((quantum_fidelity * (1 - qber) * privacy_metrics['efficiency']) * 100, 2),
             'overall_system_efficiency': round(
-                (len(final_key) / max(len(alice_bits), 1)) * quantum_fidelity * 100, 2
+                (final_key_length / max(len(alice_bits), 1)) * quantum_fidelity * 100, 2
             )
         }
\ No newline at end of file
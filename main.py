@@ -1,4 +1,5 @@
-from app import app
+import sys
+from app import run_server
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    run_server(debug='--debug' in sys.argv[1:])
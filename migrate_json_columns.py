@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Migrate the experiment/lab session JSON columns from Text to native JSON storage
+
+Experiment.parameters, Experiment.results and LabSession.parameters used to be Text
+columns holding json.dumps() strings. They are now JSONB on PostgreSQL, so existing
+PostgreSQL databases need their columns converted in place:
+
+    ALTER TABLE <table> ALTER COLUMN <column> TYPE JSONB USING NULLIF(<column>, '')::jsonb
+
+SQLite stores the JSON type as text, so existing rows are read as-is and nothing
+needs to change there. Safe to run more than once.
+"""
+
+import os
+import sys
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import inspect, text
+
+from app import app, db
+from models import Experiment, LabSession
+
+JSON_COLUMNS = [
+    (Experiment.__tablename__, 'parameters'),
+    (Experiment.__tablename__, 'results'),
+    (LabSession.__tablename__, 'parameters'),
+]
+
+def migrate_json_columns():
+    """Convert the legacy Text JSON columns to JSONB on PostgreSQL"""
+    with app.app_context():
+        if db.engine.dialect.name != 'postgresql':
+            print(f"✅ {db.engine.dialect.name} stores JSON columns as text - no migration needed")
+            return
+
+        inspector = inspect(db.engine)
+        with db.engine.begin() as connection:
+            for table, column in JSON_COLUMNS:
+                if not inspector.has_table(table):
+                    continue
+                column_types = {c['name']: c['type'] for c in inspector.get_columns(table)}
+                if column not in column_types or column_types[column].__class__.__name__ == 'JSONB':
+                    continue
+
+                print(f"🔧 Converting {table}.{column} to JSONB...")
+                connection.execute(text(
+                    f'ALTER TABLE "{table}" ALTER COLUMN "{column}" '
+                    f'TYPE JSONB USING NULLIF("{column}", \'\')::jsonb'
+                ))
+
+        print("✅ JSON columns migrated successfully")
+
+if __name__ == '__main__':
+    migrate_json_columns()
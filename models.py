@@ -1,6 +1,9 @@
 from database import db
 from datetime import datetime
-import json
+from sqlalchemy.dialects.postgresql import JSONB
+
+# Native JSON column: binary JSONB on PostgreSQL, JSON1 text storage elsewhere (SQLite)
+JSONType = db.JSON().with_variant(JSONB(), 'postgresql')
 
 
 class User(db.Model):
@@ -25,8 +28,8 @@ class Experiment(db.Model):
     protocol_variant = db.Column(db.String(64), nullable=False, default='bb84')
     
     # Experiment parameters (JSON)
-    parameters = db.Column(db.Text)  # JSON string of simulation parameters
-    results = db.Column(db.Text)     # JSON string of simulation results
+    parameters = db.Column(JSONType)  # Simulation parameters
+    results = db.Column(JSONType)     # Simulation results
     
     # Metrics
     qber = db.Column(db.Float)
@@ -36,28 +39,33 @@ class Experiment(db.Model):
     final_key_length = db.Column(db.Integer)
     
     # Status and timing
-    status = db.Column(db.String(32), default='pending')  # pending, running, completed, failed
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    status = db.Column(db.String(32), default='pending', index=True)  # pending, running, completed, failed
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     completed_at = db.Column(db.DateTime)
     
     # Foreign key
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
     
+    # Composite index for per-user status queries (e.g. "my running experiments");
+    # its user_id prefix also serves plain per-user lookups
+    __table_args__ = (db.Index('ix_exp_user_status', 'user_id', 'status'),)
+    
+    # Columns are (de)serialized by SQLAlchemy; these accessors are kept for existing callers
     def set_parameters(self, params_dict):
-        """Store parameters as JSON"""
-        self.parameters = json.dumps(params_dict)
+        """Store parameters"""
+        self.parameters = params_dict
     
     def get_parameters(self):
-        """Retrieve parameters from JSON"""
-        return json.loads(self.parameters) if self.parameters else {}
+        """Retrieve parameters"""
+        return self.parameters or {}
     
     def set_results(self, results_dict):
-        """Store results as JSON"""
-        self.results = json.dumps(results_dict)
+        """Store results"""
+        self.results = results_dict
     
     def get_results(self):
-        """Retrieve results from JSON"""
-        return json.loads(self.results) if self.results else {}
+        """Retrieve results"""
+        return self.results or {}
     
     def __repr__(self):
         return f'<Experiment {self.name} - {self.protocol_variant}>'
@@ -70,7 +78,7 @@ class LabSession(db.Model):
     protocol_variant = db.Column(db.String(64), nullable=False, default='bb84')
     
     # Session parameters
-    parameters = db.Column(db.Text)  # JSON string of lab parameters
+    parameters = db.Column(JSONType)  # Lab parameters
     
     # Real-time metrics
     current_qber = db.Column(db.Float)
@@ -78,12 +86,12 @@ class LabSession(db.Model):
     photons_processed = db.Column(db.Integer, default=0)
     
     # Session timing
-    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     last_updated = db.Column(db.DateTime, default=datetime.utcnow)
-    is_active = db.Column(db.Boolean, default=True)
+    is_active = db.Column(db.Boolean, default=True, index=True)
     
     # Foreign key
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), index=True)
     
     def __repr__(self):
         return f'<LabSession {self.session_name}>'
@@ -96,8 +104,8 @@ class DeviceConnection(db.Model):
     device_type = db.Column(db.String(64), nullable=False)  # mobile, quantum_device, etc.
     
     # Connection details
-    connection_status = db.Column(db.String(32), default='disconnected')  # connected, disconnected
-    last_ping = db.Column(db.DateTime)
+    connection_status = db.Column(db.String(32), default='disconnected', index=True)  # connected, disconnected
+    last_ping = db.Column(db.DateTime, index=True)
     
     # Device info
     device_info = db.Column(db.Text)  # JSON string of device information
@@ -1,8 +1,12 @@
 import numpy as np
-import random
+import math
 import logging
 import time
-from typing import Dict, Any
+import hashlib
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Tuple
 import os
 
 # Quantum computing imports
@@ -15,25 +19,259 @@ except ImportError:
     QISKIT_AVAILABLE = False
     logging.warning("Qiskit not available. Using simulated device metrics only.")
 
+# Import numba safely (JIT-compiled key-rate kernels, optional)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit so kernels remain importable"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
 logger = logging.getLogger(__name__)
 
+# Suitability score cut-offs for ratings D (< 40), C, B and A (>= 80)
+_RATING_T = np.array([40, 60, 80])
+_RATINGS = ('D', 'C', 'B', 'A')
+
+# dB to linear conversion: 10 ** (-dB / 10) == exp(-dB * ln(10) / 10)
+_LN10_DIV_10 = math.log(10.0) / 10.0
+
+# Binary entropy h(q) tabulated on a 0.001 grid over [0, 1] for np.interp
+_Q_GRID = np.linspace(0.0, 1.0, 1001)
+_H_LUT = np.zeros_like(_Q_GRID)
+_H_LUT[1:-1] = -_Q_GRID[1:-1] * np.log2(_Q_GRID[1:-1]) - (1 - _Q_GRID[1:-1]) * np.log2(1 - _Q_GRID[1:-1])
+
+# ITU-T G.652.D single-mode fiber at 1550nm (measured attenuation)
+_LAB_FIBER_LOSS_DB_PER_KM = 0.184
+
+# Lab fiber transmission memoized per distance; UIs reuse a handful of distances
+_TRANS_CACHE: Dict[float, float] = {}
+_TRANS_CACHE_MAX = 1024
+
+def _lab_fiber_transmission(distance: float) -> float:
+    """Transmission efficiency of the lab fiber link for a scalar distance (km)"""
+    transmission = _TRANS_CACHE.get(distance)
+    if transmission is None:
+        if len(_TRANS_CACHE) >= _TRANS_CACHE_MAX:
+            _TRANS_CACHE.clear()
+        transmission = math.exp(-_LAB_FIBER_LOSS_DB_PER_KM * distance * _LN10_DIV_10)
+        _TRANS_CACHE[distance] = transmission
+    return transmission
+
+def _batch_suffix(n: int) -> str:
+    """Log-message suffix marking a value as the mean over n > 1 configurations"""
+    return "" if n == 1 else f" (mean over {n} configurations)"
+
+def _as_float_arrays(*values):
+    """Broadcast values to contiguous 1-D float64 arrays; also report whether all inputs were scalars"""
+    arrays = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=np.float64)) for v in values))
+    return [np.ascontiguousarray(a) for a in arrays], all(np.ndim(v) == 0 for v in values)
+
+@njit(cache=True, fastmath=True)
+def _skr_lab(photon_rate, detection_efficiency, dark_count_rate, distance, transmission_efficiency,
+             environmental_fluctuation):
+    """Secure key rate and QBER for lab devices (arrays in, arrays out; transmission and noise supplied by the caller)"""
+    # Simplified secure key rate calculation
+    # R_secure = R_detect * η * (1 - h(QBER)) - leak_EC - leak_PA
+    
+    # Calculate detection rate
+    detection_rate = photon_rate * detection_efficiency * 1e6  # Convert MHz to Hz
+    
+    # ITU-T G.652.D single-mode fiber at 1550nm (measured attenuation)
+    fiber_loss_db = _LAB_FIBER_LOSS_DB_PER_KM * distance  # 0.184 dB/km experimental value
+    
+    effective_detection_rate = detection_rate * transmission_efficiency
+    
+    # Estimate QBER from dark counts and other factors with realistic quantum noise
+    signal_rate = effective_detection_rate
+    noise_rate = dark_count_rate
+    
+    # Calculate realistic QBER based on quantum system characteristics
+    # For real quantum systems, QBER includes multiple error sources:
+    # 1. Dark count ratio (baseline)
+    total_rate = signal_rate + noise_rate
+    base_qber = np.where(total_rate > 0, noise_rate / np.where(total_rate > 0, total_rate, 1.0), 0.5)
+    
+    # 2. Fiber channel loss and environmental factors (major contributors)
+    # Real QKD systems typically see 2-8% QBER due to these factors
+    channel_error_rate = 0.02 + (fiber_loss_db / 100) * 0.01  # Increases with distance
+    detector_imperfection = 0.01 + (1 - detection_efficiency) * 0.05  # Detector quality impact
+    
+    # 3. Combine all error sources for realistic QBER
+    qber = base_qber + channel_error_rate + detector_imperfection + environmental_fluctuation
+    qber = np.minimum(np.maximum(qber, 0.015), 0.25)  # Keep between 1.5% and 25% for real systems
+    
+    # Binary entropy function h(x) = -x*log2(x) - (1-x)*log2(1-x), interpolated from the table
+    h_qber = np.interp(qber, _Q_GRID, _H_LUT)
+    
+    # Secure key rate (simplified)
+    key_rate = effective_detection_rate * 0.5 * (1 - h_qber)  # 0.5 for basis matching
+    
+    # Account for error correction and privacy amplification overhead
+    ec_overhead = 1.2 * qber  # Error correction overhead
+    pa_overhead = 0.1  # Privacy amplification overhead
+    
+    final_key_rate = np.maximum(0.0, key_rate * (1 - ec_overhead - pa_overhead))
+    return final_key_rate, qber
+
+@njit(cache=True, fastmath=True)
+def _skr_mobile(photon_rate, detection_efficiency, qber, distance, total_measurements):
+    """Secure key rate from real mobile measurements (arrays in, array out)"""
+    # Base calculation similar to lab version but adjusted for mobile
+    detection_rate = photon_rate * detection_efficiency * 1e6
+    
+    # Account for distance-based loss
+    fiber_loss_db = 0.2 * distance
+    transmission_efficiency = np.exp(-fiber_loss_db * _LN10_DIV_10)  # 10^(-dB/10)
+    effective_detection_rate = detection_rate * transmission_efficiency
+    
+    # Use real QBER from measurements (table gives h = 0 at qber 0 and 1)
+    h_qber = np.interp(qber, _Q_GRID, _H_LUT)
+    
+    # Key rate calculation
+    key_rate = effective_detection_rate * 0.5 * (1 - h_qber)
+    
+    # Mobile overhead is higher
+    ec_overhead = 1.5 * qber  # Higher error correction overhead
+    pa_overhead = 0.15  # Higher privacy amplification overhead
+    
+    final_key_rate = np.maximum(0.0, key_rate * (1 - ec_overhead - pa_overhead))
+    
+    # Scale by actual measurement count
+    return np.where(total_measurements < 1000, final_key_rate * (total_measurements / 1000), final_key_rate)
+
+# Accepted encodings of a measured bit (True/False hash as 1/0)
+_BIT_VALUES = {0: 0, 1: 1, '0': 0, '1': 1}
+
+def _as_measurement_list(values, name: str) -> list:
+    """Mobile measurement sequence as a list (a string is a sequence of symbols)"""
+    if values is None:
+        return []
+    if not isinstance(values, (list, tuple, str)):
+        raise ValueError(f"Mobile data '{name}' must be an array")
+    return list(values)
+
+def _as_bit_array(values) -> np.ndarray:
+    """Validated mobile measurement bits (0/1 numbers or '0'/'1' symbols) as a uint8 array"""
+    bits = _as_measurement_list(values, 'bits')
+    try:
+        return np.fromiter(map(_BIT_VALUES.__getitem__, bits), dtype=np.uint8, count=len(bits))
+    except (KeyError, TypeError):
+        raise ValueError("Mobile data 'bits' must contain only 0/1 values") from None
+
+def _bucket(thresholds: np.ndarray, scores: np.ndarray, value, side: str = 'left'):
+    """Score for value from sorted thresholds (works element-wise on arrays)"""
+    return scores[np.searchsorted(thresholds, value, side=side)]
+
 class QuantumDeviceTestbed:
     """Quantum Device Testbed for evaluating QKD hardware performance"""
     
+    # Suitability scoring buckets: score S[k] where k = number of thresholds T the value exceeds
+    # (for QBER, lower is better: k = number of thresholds at or below the value)
+    _FIDELITY_T = np.array([0.85, 0.90, 0.95])
+    _FIDELITY_S = np.array([0, 10, 20, 30])
+    _DETECTION_T = np.array([0.70, 0.80, 0.90])
+    _DETECTION_S = np.array([10, 15, 20, 25])
+    _QBER_T = np.array([0.05, 0.10, 0.15])
+    _QBER_S = np.array([25, 20, 15, 5])
+    _KEY_RATE_T = np.array([100, 500, 1000])
+    _KEY_RATE_S = np.array([5, 10, 15, 20])
+    
+    _MOBILE_FIDELITY_T = np.array([0.75, 0.80, 0.85, 0.90])
+    _MOBILE_FIDELITY_S = np.array([5, 15, 20, 25, 30])
+    _MOBILE_DETECTION_T = np.array([0.60, 0.70, 0.80])
+    _MOBILE_DETECTION_S = np.array([10, 15, 20, 25])
+    _MOBILE_KEY_RATE_T = np.array([100, 250, 500])
+    _MOBILE_KEY_RATE_S = np.array([5, 10, 15, 20])
+    
+    # Recommendations indexed like _RATINGS
+    _RECOMMENDATIONS = (
+        "Not suitable for secure QKD",
+        "Marginal - requires significant optimization",
+        "Good for QKD with optimization",
+        "Excellent for QKD deployment",
+    )
+    _MOBILE_RECOMMENDATIONS = (
+        "Mobile device not suitable for secure QKD",
+        "Marginal mobile device - requires calibration",
+        "Good mobile device with minor optimization needed",
+        "Excellent mobile device for QKD measurements",
+    )
+    
+    _kernels_warm = False
+    
+    # IBM Quantum service and backend configuration per hashed API key: (service, device_info, created)
+    _SERVICE_CACHE_TTL = 300.0  # seconds
+    _service_cache: Dict[str, Tuple[Any, Dict[str, Any], float]] = {}
+    _service_cache_lock = threading.Lock()
+    _executor = None  # Created on first use; shared because testbeds are created per request
+    _MAX_TEST_LOGS = 1000  # Bound log memory for long-running sessions
+    
     def __init__(self):
-        self.test_logs = []
-        
+        # Logs stored as parallel columns; test_logs materializes the dict form on demand
+        self._log_timestamps = deque(maxlen=self._MAX_TEST_LOGS)
+        self._log_messages = deque(maxlen=self._MAX_TEST_LOGS)
+        self._log_levels = deque(maxlen=self._MAX_TEST_LOGS)
+        self._last_log_second = -1
+        self._last_log_timestamp = ''
+        self._rng = np.random.default_rng()
+        
+        # Compile (or load from cache) the key-rate kernels once, outside request handling
+        if NUMBA_AVAILABLE and not QuantumDeviceTestbed._kernels_warm:
+            warm = np.ones(1)
+            _skr_lab(warm, warm, warm, warm, warm, warm)
+            _skr_mobile(warm, warm, warm, warm, warm)
+            QuantumDeviceTestbed._kernels_warm = True
+        
+    @classmethod
+    def _background_executor(cls) -> ThreadPoolExecutor:
+        """Shared worker pool for overlapping device I/O with local measurements"""
+        with cls._service_cache_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='testbed-io')
+            return cls._executor
+    
+    @property
+    def test_logs(self) -> list:
+        """Test log entries as a list of {'timestamp', 'message', 'level'} dicts"""
+        return [
+            {'timestamp': timestamp, 'message': message, 'level': level}
+            for timestamp, message, level in zip(self._log_timestamps, self._log_messages, self._log_levels)
+        ]
+    
+    def clear_logs(self) -> None:
+        """Discard all test log entries"""
+        self._log_timestamps.clear()
+        self._log_messages.clear()
+        self._log_levels.clear()
+    
     def log_message(self, message: str, level: str = 'info') -> None:
         """Add message to test logs"""
-        timestamp = time.strftime('%H:%M:%S')
-        log_entry = {'timestamp': timestamp, 'message': message, 'level': level}
-        self.test_logs.append(log_entry)
-        logger.info(f"TESTBED: {message}")
+        # Format the wall-clock timestamp at most once per second
+        second = int(time.time())
+        if second != self._last_log_second:
+            self._last_log_second = second
+            self._last_log_timestamp = time.strftime('%H:%M:%S', time.localtime(second))
+        self._log_timestamps.append(self._last_log_timestamp)
+        self._log_messages.append(message)
+        self._log_levels.append(level)
+        logger.info("TESTBED: %s", message)
     
-    def test_quantum_device_connectivity(self, api_key: str = None) -> Dict[str, Any]:
-        """Test connectivity to IBM Quantum devices"""
+    def test_quantum_device_connectivity(self, api_key: str = None, log=None) -> Dict[str, Any]:
+        """
+        Test connectivity to IBM Quantum devices
+        
+        log: callable(message, level) receiving the log lines; defaults to log_message.
+        Background callers collect the lines and log them on the request thread.
+        """
+        log = log or self.log_message
         if not QISKIT_AVAILABLE:
-            self.log_message("Qiskit not available for device testing", "error")
+            log("Qiskit not available for device testing", "error")
             return {
                 'connected': False,
                 'backend': 'simulation',
@@ -42,26 +280,36 @@ class QuantumDeviceTestbed:
         
         try:
             if api_key:
-                service = QiskitRuntimeService(channel="ibm_quantum_platform", token=api_key)
-                self.log_message("Connected to IBM Quantum Platform", "success")
+                key_source = "Connected to IBM Quantum Platform"
             else:
                 api_key = os.environ.get("IBM_QUANTUM_API_KEY")
-                if api_key:
-                    service = QiskitRuntimeService(channel="ibm_quantum_platform", token=api_key)
-                    self.log_message("Connected to IBM Quantum Platform with environment key", "success")
-                else:
+                if not api_key:
                     raise Exception("No IBM Quantum API key provided")
+                key_source = "Connected to IBM Quantum Platform with environment key"
+            
+            # Service construction and backend discovery are network round-trips; reuse a
+            # recent result for the same key (cached under a hash, never the raw token)
+            cache_key = hashlib.sha256(api_key.encode()).hexdigest()
+            with QuantumDeviceTestbed._service_cache_lock:
+                cached = QuantumDeviceTestbed._service_cache.get(cache_key)
+            if cached is not None and time.monotonic() - cached[2] < self._SERVICE_CACHE_TTL:
+                log(f"{key_source} (cached)", "success")
+                log(f"Connected to device: {cached[1]['backend']}", "success")
+                return dict(cached[1])
+            
+            service = QiskitRuntimeService(channel="ibm_quantum_platform", token=api_key)
+            log(key_source, "success")
             
             # Get available backends
             backends = service.backends()
             if backends:
                 backend = backends[0]
-                self.log_message(f"Connected to device: {backend.name}", "success")
+                log(f"Connected to device: {backend.name}", "success")
                 
                 # Get device properties
                 configuration = backend.configuration()
                 
-                return {
+                device_info = {
                     'connected': True,
                     'backend': backend.name,
                     'num_qubits': configuration.n_qubits,
@@ -69,11 +317,14 @@ class QuantumDeviceTestbed:
                     'coupling_map': str(configuration.coupling_map) if hasattr(configuration, 'coupling_map') else 'All-to-all',
                     'quantum_volume': getattr(configuration, 'quantum_volume', 'Not specified')
                 }
+                with QuantumDeviceTestbed._service_cache_lock:
+                    QuantumDeviceTestbed._service_cache[cache_key] = (service, device_info, time.monotonic())
+                return dict(device_info)
             else:
                 raise Exception("No quantum backends available")
                 
         except Exception as e:
-            self.log_message(f"Device connection failed: {str(e)}", "error")
+            log(f"Device connection failed: {str(e)}", "error")
             
             return {
                 'connected': False,
@@ -81,8 +332,8 @@ class QuantumDeviceTestbed:
                 'error': str(e)
             }
     
-    def measure_device_fidelity(self, backend_info: Dict[str, Any]) -> float:
-        """Measure quantum state fidelity of the device"""
+    def measure_device_fidelity(self, backend_info: Dict[str, Any], size: int = None):
+        """Measure quantum state fidelity of the device (an array of size measurements if size is given)"""
         if backend_info['connected']:
             # Based on 2024 IBM Quantum device characterizations
             base_fidelity = 0.9952  # State preparation fidelity for high-quality systems
@@ -91,99 +342,158 @@ class QuantumDeviceTestbed:
             num_qubits = backend_info.get('num_qubits', 5)
             fidelity_degradation = min(0.08, num_qubits * 0.003)  # Crosstalk and decoherence
             
-            measured_fidelity = base_fidelity - fidelity_degradation + random.uniform(-0.015, 0.015)
-            measured_fidelity = max(0.92, min(0.998, measured_fidelity))  # Experimental range
-            
-            self.log_message(f"Device fidelity measured: {measured_fidelity:.3f}", "info")
+            measured_fidelity = base_fidelity - fidelity_degradation + self._rng.uniform(-0.015, 0.015, size)
+            if size is None:
+                measured_fidelity = max(0.92, min(0.998, float(measured_fidelity)))  # Experimental range
+                self.log_message(f"Device fidelity measured: {measured_fidelity:.3f}", "info")
+            else:
+                measured_fidelity = np.clip(measured_fidelity, 0.92, 0.998)
+                self.log_message(f"Device fidelity measured: {measured_fidelity.mean():.3f}"
+                                 f"{_batch_suffix(size)}", "info")
             return measured_fidelity
         else:
             # No device connected - cannot measure fidelity
             self.log_message("Cannot measure fidelity - no device connected", "error")
             return None
     
-    def measure_detection_efficiency(self, photon_rate: float) -> float:
-        """Measure photon detection efficiency"""
+    def measure_detection_efficiency(self, photon_rate, log=None):
+        """
+        Measure photon detection efficiency (element-wise for an array of photon rates)
+        
+        log: callable(message, level) receiving the log line; defaults to log_message.
+        """
+        log = log or self.log_message
         # Based on InGaAs APD measurements at 1550nm (2024 commercial systems)
         base_efficiency = 0.237  # 23.7% quantum efficiency for cooled detectors
         
-        # Dead time effects from ID Quantique commercial detectors
-        rate_factor = 1.0 if photon_rate < 200 else 1.0 - min(0.15, (photon_rate - 200) / 800)
-        
-        efficiency = base_efficiency * rate_factor + random.uniform(-0.02, 0.02)
-        efficiency = max(0.15, min(0.4, efficiency))  # Realistic operational range
-        
-        self.log_message(f"Detection efficiency: {efficiency:.3f} at {photon_rate} MHz", "info")
+        if np.ndim(photon_rate) == 0:
+            # Dead time effects from ID Quantique commercial detectors
+            rate_factor = 1.0 if photon_rate < 200 else 1.0 - min(0.15, (photon_rate - 200) / 800)
+            
+            efficiency = base_efficiency * rate_factor + self._rng.uniform(-0.02, 0.02)
+            efficiency = max(0.15, min(0.4, float(efficiency)))  # Realistic operational range
+            
+            log(f"Detection efficiency: {efficiency:.3f} at {photon_rate} MHz", "info")
+            return efficiency
+        
+        rate_factor = 1.0 - np.clip((photon_rate - 200) / 800, 0.0, 0.15)
+        efficiency = base_efficiency * rate_factor + self._rng.uniform(-0.02, 0.02, np.shape(photon_rate))
+        efficiency = np.clip(efficiency, 0.15, 0.4)
+        log(f"Detection efficiency: {efficiency.mean():.3f} at {np.mean(photon_rate):g} MHz"
+            f"{_batch_suffix(efficiency.size)}", "info")
         return efficiency
     
-    def measure_dark_count_rate(self) -> float:
-        """Measure detector dark count rate"""
+    def measure_dark_count_rate(self, size: int = None, log=None):
+        """
+        Measure detector dark count rate (an array of size measurements if size is given)
+        
+        log: callable(message, level) receiving the log line; defaults to log_message.
+        """
+        log = log or self.log_message
         # Based on thermoelectrically cooled InGaAs APD data (2024)
-        base_dark_count = random.uniform(220, 450)  # Typical at -40°C to -50°C operation
+        base_dark_count = self._rng.uniform(220, 450, size)  # Typical at -40°C to -50°C operation
         
-        self.log_message(f"Dark count rate: {base_dark_count:.1f} Hz", "info")
+        if size is None:
+            log(f"Dark count rate: {base_dark_count:.1f} Hz", "info")
+        else:
+            log(f"Dark count rate: {base_dark_count.mean():.1f} Hz{_batch_suffix(size)}", "info")
         return base_dark_count
     
-    def calculate_secure_key_rate(self, photon_rate: float, detection_efficiency: float, 
-                                dark_count_rate: float, distance: float = 10.0) -> float:
-        """Calculate theoretical secure key generation rate"""
-        
-        # Simplified secure key rate calculation
-        # R_secure = R_detect * η * (1 - h(QBER)) - leak_EC - leak_PA
-        
-        # Calculate detection rate
-        detection_rate = photon_rate * detection_efficiency * 1e6  # Convert MHz to Hz
-        
-        # ITU-T G.652.D single-mode fiber at 1550nm (measured attenuation)
-        fiber_loss_db = 0.184 * distance  # 0.184 dB/km experimental value
-        transmission_efficiency = 10 ** (-fiber_loss_db / 10)
-        
-        effective_detection_rate = detection_rate * transmission_efficiency
-        
-        # Estimate QBER from dark counts and other factors with realistic quantum noise
-        signal_rate = effective_detection_rate
-        noise_rate = dark_count_rate
-        
-        # Calculate realistic QBER based on quantum system characteristics
-        # For real quantum systems, QBER includes multiple error sources:
-        # 1. Dark count ratio (baseline)
-        base_qber = noise_rate / (signal_rate + noise_rate) if (signal_rate + noise_rate) > 0 else 0.5
-        
-        # 2. Fiber channel loss and environmental factors (major contributors)
-        # Real QKD systems typically see 2-8% QBER due to these factors
-        channel_error_rate = 0.02 + (fiber_loss_db / 100) * 0.01  # Increases with distance
-        detector_imperfection = 0.01 + (1 - detection_efficiency) * 0.05  # Detector quality impact
-        environmental_fluctuation = np.random.uniform(0.005, 0.02)  # Temperature, vibration, etc.
-        
-        # 3. Combine all error sources for realistic QBER
-        qber = base_qber + channel_error_rate + detector_imperfection + environmental_fluctuation
-        qber = min(0.25, max(0.015, qber))  # Keep between 1.5% and 25% for real systems
-        
-        # Binary entropy function h(x) = -x*log2(x) - (1-x)*log2(1-x)
-        if qber == 0 or qber == 1:
-            h_qber = 0
+    def calculate_secure_key_rate(self, photon_rate, detection_efficiency, dark_count_rate,
+                                  distance=10.0):
+        """
+        Calculate theoretical secure key generation rate
+        
+        Accepts scalars or NumPy arrays (broadcast together) so parameter sweeps
+        are evaluated in one vectorized pass. Returns (final_key_rate, qber) as
+        floats for scalar input, arrays otherwise.
+        """
+        scalar_distance = np.ndim(distance) == 0
+        if scalar_distance:
+            transmission_efficiency = _lab_fiber_transmission(float(distance))
+        if scalar_distance and np.ndim(photon_rate) == np.ndim(detection_efficiency) == 0:
+            effective_detection_rate = photon_rate * detection_efficiency * 1e6 * transmission_efficiency
+            if effective_detection_rate <= 0 and np.ndim(dark_count_rate) == 0:
+                # Nothing reaches the detector: no key, and the dark-count ratio pins QBER
+                # at the 25% ceiling regardless of the environmental noise draw
+                self.log_message("Secure key rate: 0 bps (QBER: 0.250, no photons detected)", "info")
+                return 0.0, 0.25
+        
+        (photon_rate, detection_efficiency, dark_count_rate, distance), scalar = _as_float_arrays(
+            photon_rate, detection_efficiency, dark_count_rate, distance
+        )
+        if scalar_distance:
+            transmission_efficiency = np.full_like(distance, transmission_efficiency)
         else:
-            h_qber = -qber * np.log2(qber) - (1-qber) * np.log2(1-qber)
-        
-        # Secure key rate (simplified)
-        key_rate = effective_detection_rate * 0.5 * (1 - h_qber)  # 0.5 for basis matching
+            transmission_efficiency = np.exp(-_LAB_FIBER_LOSS_DB_PER_KM * distance * _LN10_DIV_10)  # 10^(-dB/10)
+        environmental_fluctuation = self._rng.uniform(0.005, 0.02, size=photon_rate.shape)  # Temperature, vibration, etc.
         
-        # Account for error correction and privacy amplification overhead
-        ec_overhead = 1.2 * qber  # Error correction overhead
-        pa_overhead = 0.1  # Privacy amplification overhead
-        
-        final_key_rate = max(0, key_rate * (1 - ec_overhead - pa_overhead))
+        final_key_rate, qber = _skr_lab(
+            photon_rate, detection_efficiency, dark_count_rate, distance, transmission_efficiency,
+            environmental_fluctuation
+        )
         
-        self.log_message(f"Secure key rate: {final_key_rate:.0f} bps (QBER: {qber:.3f})", "info")
+        if scalar:
+            final_key_rate, qber = float(final_key_rate[0]), float(qber[0])
+            self.log_message(f"Secure key rate: {final_key_rate:.0f} bps (QBER: {qber:.3f})", "info")
+        else:
+            self.log_message(f"Secure key rate: {final_key_rate.mean():.0f} bps "
+                             f"(QBER: {qber.mean():.3f}){_batch_suffix(final_key_rate.size)}", "info")
         return final_key_rate, qber
     
     def analyze_device(self, photon_rate: float, api_key: str = None) -> Dict[str, Any]:
         """Comprehensive device analysis for QKD suitability"""
+        result = self.analyze_device_batch(np.array([photon_rate], dtype=np.float64), api_key=api_key)
+        if result.get('status') != 'success':
+            return result
         
-        self.test_logs = []
+        metrics = {name: float(values[0]) for name, values in result['metrics'].items() if name != 'distance'}
+        metrics['photon_rate'] = photon_rate
+        analysis = result['analysis']
+        return {
+            'status': 'success',
+            'timestamp': result['timestamp'],
+            'device_info': result['device_info'],
+            'metrics': metrics,
+            'analysis': {
+                'suitability_score': int(analysis['suitability_score'][0]),
+                'rating': analysis['rating'][0],
+                'recommendation': analysis['recommendation'][0]
+            },
+            'logs': result['logs'],
+            'is_secure': bool(result['is_secure'][0])  # Standard QBER threshold
+        }
+    
+    def analyze_device_batch(self, photon_rates, distances=10.0, api_key: str = None) -> Dict[str, Any]:
+        """
+        Device analysis for QKD suitability over many (photon_rate, distance) configurations
+        
+        photon_rates and distances are broadcast together; all measurement noise is drawn
+        at once and metrics, scores and ratings are computed as arrays of length N.
+        """
+        self.clear_logs()
         self.log_message("Starting quantum device testbed analysis", "info")
         
-        # Test device connectivity
-        device_info = self.test_quantum_device_connectivity(api_key)
+        (photon_rates, distances), _ = _as_float_arrays(photon_rates, distances)
+        n = photon_rates.size
+        
+        # Test device connectivity; the IBM Quantum round-trip runs in the background while the
+        # device-independent detector measurements are taken. Their log lines are held back
+        # until the device is known to be connected.
+        if QISKIT_AVAILABLE:
+            connectivity_log = []
+            measurement_log = []
+            connectivity = self._background_executor().submit(
+                self.test_quantum_device_connectivity, api_key,
+                lambda message, level='info': connectivity_log.append((message, level)))
+            collect = lambda message, level='info': measurement_log.append((message, level))
+            detection_efficiency = self.measure_detection_efficiency(photon_rates, log=collect)
+            dark_count_rate = self.measure_dark_count_rate(n, log=collect)
+            device_info = connectivity.result()
+            for message, level in connectivity_log:
+                self.log_message(message, level)
+        else:
+            device_info = self.test_quantum_device_connectivity(api_key)
         
         # Only proceed if device is actually connected
         if not device_info['connected']:
@@ -198,72 +508,32 @@ class QuantumDeviceTestbed:
                 'logs': self.test_logs
             }
         
-        # Measure device characteristics (only if connected)
-        fidelity = self.measure_device_fidelity(device_info)
-        detection_efficiency = self.measure_detection_efficiency(photon_rate)
-        dark_count_rate = self.measure_dark_count_rate()
+        # Measure device characteristics (only reported if connected)
+        fidelity = self.measure_device_fidelity(device_info, n)
+        for message, level in measurement_log:
+            self.log_message(message, level)
         
         # Calculate performance metrics
         secure_key_rate, qber = self.calculate_secure_key_rate(
-            photon_rate, detection_efficiency, dark_count_rate
+            photon_rates, detection_efficiency, dark_count_rate, distances
         )
         
-        # Determine device suitability
-        suitability_score = 0
-        
-        # Fidelity score (30%)
-        if fidelity > 0.95:
-            suitability_score += 30
-        elif fidelity > 0.90:
-            suitability_score += 20
-        elif fidelity > 0.85:
-            suitability_score += 10
-        
-        # Detection efficiency score (25%)
-        if detection_efficiency > 0.90:
-            suitability_score += 25
-        elif detection_efficiency > 0.80:
-            suitability_score += 20
-        elif detection_efficiency > 0.70:
-            suitability_score += 15
-        else:
-            suitability_score += 10
-        
-        # QBER score (25%)
-        if qber < 0.05:
-            suitability_score += 25
-        elif qber < 0.10:
-            suitability_score += 20
-        elif qber < 0.15:
-            suitability_score += 15
-        else:
-            suitability_score += 5
-        
-        # Key rate score (20%)
-        if secure_key_rate > 1000:
-            suitability_score += 20
-        elif secure_key_rate > 500:
-            suitability_score += 15
-        elif secure_key_rate > 100:
-            suitability_score += 10
-        else:
-            suitability_score += 5
+        # Determine device suitability: fidelity (30%), detection efficiency (25%), QBER (25%), key rate (20%)
+        suitability_score = (
+            _bucket(self._FIDELITY_T, self._FIDELITY_S, fidelity) +
+            _bucket(self._DETECTION_T, self._DETECTION_S, detection_efficiency) +
+            _bucket(self._QBER_T, self._QBER_S, qber, side='right') +
+            _bucket(self._KEY_RATE_T, self._KEY_RATE_S, secure_key_rate)
+        )
         
         # Determine recommendation
-        if suitability_score >= 80:
-            recommendation = "Excellent for QKD deployment"
-            rating = "A"
-        elif suitability_score >= 60:
-            recommendation = "Good for QKD with optimization"
-            rating = "B"
-        elif suitability_score >= 40:
-            recommendation = "Marginal - requires significant optimization"
-            rating = "C"
-        else:
-            recommendation = "Not suitable for secure QKD"
-            rating = "D"
+        rating_index = np.searchsorted(_RATING_T, suitability_score, side='right')
+        ratings = [_RATINGS[k] for k in rating_index]
         
-        self.log_message(f"Device analysis complete. Rating: {rating}", "success")
+        if n == 1:
+            self.log_message(f"Device analysis complete. Rating: {ratings[0]}", "success")
+        else:
+            self.log_message(f"Device analysis complete for {n} configurations", "success")
         
         return {
             'status': 'success',
@@ -275,12 +545,13 @@ class QuantumDeviceTestbed:
                 'dark_count_rate': dark_count_rate,
                 'secure_key_rate': secure_key_rate,
                 'qber': qber,
-                'photon_rate': photon_rate
+                'photon_rate': photon_rates,
+                'distance': distances
             },
             'analysis': {
                 'suitability_score': suitability_score,
-                'rating': rating,
-                'recommendation': recommendation
+                'rating': ratings,
+                'recommendation': [self._RECOMMENDATIONS[k] for k in rating_index]
             },
             'logs': self.test_logs,
             'is_secure': qber < 0.11  # Standard QBER threshold
@@ -288,6 +559,7 @@ class QuantumDeviceTestbed:
     
     def analyze_mobile_data(self, mobile_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze quantum measurement data from mobile device"""
+        self.clear_logs()
         self.log_message("Processing mobile device quantum measurements", "info")
         
         # Extract measurement data
@@ -296,13 +568,14 @@ class QuantumDeviceTestbed:
         device_info = mobile_data.get('device_info', {})
         
         # Simulate quantum device metrics based on mobile data
-        detection_count = len(photon_detections) if photon_detections else np.random.poisson(150)
+        detection_count = len(photon_detections) if photon_detections else int(self._rng.poisson(150))
         
         # Calculate metrics
         detection_efficiency = min(0.95, detection_count / (150 * measurement_duration))
-        dark_count_rate = max(0.001, np.random.exponential(0.01))  # kHz
+        dark_draw, qber_draw = self._rng.standard_exponential(2) * (0.01, 0.025)
+        dark_count_rate = max(0.001, float(dark_draw))  # kHz
         secure_key_rate = detection_efficiency * 10.5  # kbps
-        device_qber = max(0.001, min(0.15, np.random.exponential(0.025)))
+        device_qber = max(0.001, min(0.15, float(qber_draw)))
         
         # Determine if using real quantum hardware or simulation
         backend_type = "mobile_quantum_sensor"
@@ -341,36 +614,37 @@ class QuantumDeviceTestbed:
     def process_mobile_data(self, mobile_data: Dict[str, Any], device_id: str) -> Dict[str, Any]:
         """Process real-time quantum measurement data from mobile devices"""
         
-        self.test_logs = []
+        self.clear_logs()
         self.log_message(f"Processing mobile data from device: {device_id}", "info")
         
         try:
             # Extract measurement data from mobile device
-            bits = mobile_data.get('bits', [])
-            bases = mobile_data.get('bases', [])
+            # Validate and convert measurement sequences once (strings are treated as per-character sequences)
+            bits = _as_bit_array(mobile_data.get('bits', []))
+            bases = _as_measurement_list(mobile_data.get('bases', []), 'bases')
             timestamp = mobile_data.get('timestamp', time.time())
             photon_rate = mobile_data.get('photon_rate', 100)
             distance = mobile_data.get('distance', 10.0)
-            measurement_errors = mobile_data.get('measurement_errors', [])
+            measurement_errors = _as_measurement_list(mobile_data.get('measurement_errors'), 'measurement_errors')
             device_info = mobile_data.get('device_info', {})
             
             # Validate input data
-            if not bits or not bases:
+            if bits.size == 0 or not bases:
                 raise ValueError("Mobile data must contain 'bits' and 'bases' arrays")
             
-            if len(bits) != len(bases):
+            if bits.size != len(bases):
                 raise ValueError("Bits and bases arrays must have the same length")
             
-            self.log_message(f"Received {len(bits)} measurements from mobile device", "info")
+            self.log_message(f"Received {bits.size} measurements from mobile device", "info")
             
             # Calculate real metrics based on mobile measurement data
-            fidelity = self.calculate_mobile_fidelity(bits, bases, measurement_errors)
-            detection_efficiency = self.calculate_mobile_detection_efficiency(mobile_data)
-            dark_count_rate = self.estimate_mobile_dark_counts(measurement_errors)
+            fidelity, detection_efficiency, dark_count_rate = self._compute_mobile_metrics(
+                bits, measurement_errors, mobile_data
+            )
             
             # Calculate QBER from real measurement errors
-            total_measurements = len(bits)
-            error_count = len(measurement_errors) if measurement_errors else 0
+            total_measurements = bits.size
+            error_count = len(measurement_errors)
             qber = error_count / total_measurements if total_measurements > 0 else 0.0
             
             # Calculate secure key rate based on real data
@@ -384,18 +658,9 @@ class QuantumDeviceTestbed:
             )
             
             # Determine rating and recommendation
-            if suitability_score >= 80:
-                recommendation = "Excellent mobile device for QKD measurements"
-                rating = "A"
-            elif suitability_score >= 60:
-                recommendation = "Good mobile device with minor optimization needed"
-                rating = "B"
-            elif suitability_score >= 40:
-                recommendation = "Marginal mobile device - requires calibration"
-                rating = "C"
-            else:
-                recommendation = "Mobile device not suitable for secure QKD"
-                rating = "D"
+            rating_index = int(np.searchsorted(_RATING_T, suitability_score, side='right'))
+            rating = _RATINGS[rating_index]
+            recommendation = self._MOBILE_RECOMMENDATIONS[rating_index]
             
             self.log_message(f"Mobile device analysis complete. Rating: {rating}", "success")
             
@@ -426,7 +691,7 @@ class QuantumDeviceTestbed:
                     'recommendation': recommendation
                 },
                 'raw_data': {
-                    'bits': bits[:10],  # Store first 10 for debugging
+                    'bits': bits[:10].tolist(),  # Store first 10 for debugging
                     'bases': bases[:10],
                     'errors': measurement_errors[:10]
                 },
@@ -444,143 +709,84 @@ class QuantumDeviceTestbed:
                 'logs': self.test_logs
             }
     
-    def calculate_mobile_fidelity(self, bits: list, bases: list, errors: list) -> float:
-        """Calculate quantum state fidelity from mobile measurement data"""
-        if not bits or not bases:
-            return 0.0
+    def _compute_mobile_metrics(self, bits, errors, mobile_data: Dict[str, Any]) -> Tuple[float, float, float]:
+        """
+        Fidelity, detection efficiency and dark count rate from mobile measurement data
         
-        total_measurements = len(bits)
-        error_count = len(errors) if errors else 0
+        Reads the measurement arrays and sensor readings once and draws all three
+        random perturbations in a single call.
         
-        # Calculate fidelity based on measurement errors
-        success_rate = 1.0 - (error_count / total_measurements)
-        
-        # Mobile devices typically have lower fidelity than lab equipment
-        base_mobile_fidelity = 0.88
-        measured_fidelity = base_mobile_fidelity * success_rate
-        
-        # Add some realistic variation
-        measured_fidelity += random.uniform(-0.03, 0.03)
-        measured_fidelity = max(0.7, min(0.95, measured_fidelity))
+        Returns:
+            Tuple of (fidelity, detection_efficiency, dark_count_rate)
+        """
+        total_measurements = len(bits)
+        error_count = len(errors)
+        fidelity_noise, efficiency_noise, random_dark_count = self._rng.uniform(
+            (-0.03, -0.05, 100.0), (0.03, 0.05, 1000.0)
+        )
         
-        self.log_message(f"Mobile device fidelity: {measured_fidelity:.3f}", "info")
-        return measured_fidelity
-    
-    def calculate_mobile_detection_efficiency(self, mobile_data: Dict[str, Any]) -> float:
-        """Calculate detection efficiency from mobile sensor data"""
-        # Mobile devices have varying sensor capabilities
-        base_efficiency = 0.75  # Lower than lab equipment
+        # Fidelity from measurement errors; mobile devices have lower fidelity than lab equipment
+        if total_measurements == 0:
+            fidelity = 0.0
+        else:
+            success_rate = 1.0 - (error_count / total_measurements)
+            base_mobile_fidelity = 0.88
+            fidelity = max(0.7, min(0.95, float(base_mobile_fidelity * success_rate + fidelity_noise)))
         
-        # Adjust based on environmental factors if provided
+        # Detection efficiency: lower base than lab equipment, adjusted for environmental factors
+        base_efficiency = 0.75
         ambient_light = mobile_data.get('ambient_light', 50)  # lux
         temperature = mobile_data.get('temperature', 25)  # celsius
-        
-        # Light interference reduces efficiency
-        light_factor = max(0.8, 1.0 - (ambient_light / 1000))
-        
-        # Temperature effects
-        temp_factor = 1.0 - abs(temperature - 25) * 0.002
-        
-        efficiency = base_efficiency * light_factor * temp_factor
-        efficiency += random.uniform(-0.05, 0.05)
-        efficiency = max(0.5, min(0.9, efficiency))
-        
-        self.log_message(f"Mobile detection efficiency: {efficiency:.3f}", "info")
-        return efficiency
-    
-    def estimate_mobile_dark_counts(self, errors: list) -> float:
-        """Estimate dark count rate from mobile measurement errors"""
-        if not errors:
-            base_dark_count = random.uniform(100, 1000)  # Higher than lab equipment
-        else:
-            # Estimate based on error frequency
-            error_rate = len(errors) / 100  # Assume 100 measurements per second
-            base_dark_count = error_rate * 10000  # Scale to Hz
-        
-        base_dark_count = max(100, min(5000, base_dark_count))
-        self.log_message(f"Mobile dark count rate: {base_dark_count:.1f} Hz", "info")
-        return base_dark_count
-    
+        light_factor = max(0.8, 1.0 - (ambient_light / 1000))  # Light interference reduces efficiency
+        temp_factor = 1.0 - abs(temperature - 25) * 0.002  # Temperature effects
+        efficiency = max(0.5, min(0.9, float(base_efficiency * light_factor * temp_factor + efficiency_noise)))
+        
+        # Dark counts: estimated from error frequency (assume 100 measurements per second, scaled
+        # to Hz), otherwise a random rate higher than lab equipment
+        dark_count_rate = (error_count / 100) * 10000 if error_count else random_dark_count
+        dark_count_rate = max(100.0, min(5000.0, float(dark_count_rate)))
+        
+        self.log_message(f"Mobile device fidelity: {fidelity:.3f}, detection efficiency: {efficiency:.3f}, "
+                         f"dark count rate: {dark_count_rate:.1f} Hz", "info")
+        return fidelity, efficiency, dark_count_rate
+
+    def calculate_mobile_fidelity(self, bits, bases, errors) -> float:
+        """Calculate quantum state fidelity from mobile measurement data (lists or arrays)"""
+        if len(bits) == 0 or len(bases) == 0:
+            return 0.0
+        return self._compute_mobile_metrics(bits, errors if errors is not None else (), {})[0]
+
+    def calculate_mobile_detection_efficiency(self, mobile_data: Dict[str, Any]) -> float:
+        """Calculate detection efficiency from mobile sensor data"""
+        return self._compute_mobile_metrics((), (), mobile_data)[1]
+
+    def estimate_mobile_dark_counts(self, errors) -> float:
+        """Estimate dark count rate from mobile measurement errors (list or array)"""
+        return self._compute_mobile_metrics((), errors if errors is not None else (), {})[2]
+
     def calculate_real_secure_key_rate(self, photon_rate: float, detection_efficiency: float, 
                                      qber: float, distance: float, total_measurements: int) -> float:
         """Calculate secure key rate from real mobile measurements"""
+        arrays, scalar = _as_float_arrays(photon_rate, detection_efficiency, qber, distance, total_measurements)
+        final_key_rate = _skr_mobile(*arrays)
         
-        # Base calculation similar to lab version but adjusted for mobile
-        detection_rate = photon_rate * detection_efficiency * 1e6
-        
-        # Account for distance-based loss
-        fiber_loss_db = 0.2 * distance
-        transmission_efficiency = 10 ** (-fiber_loss_db / 10)
-        effective_detection_rate = detection_rate * transmission_efficiency
-        
-        # Use real QBER from measurements
-        if qber == 0 or qber == 1:
-            h_qber = 0
+        if scalar:
+            final_key_rate = float(final_key_rate[0])
+            self.log_message(f"Mobile secure key rate: {final_key_rate:.0f} bps", "info")
         else:
-            h_qber = -qber * np.log2(qber) - (1-qber) * np.log2(1-qber)
-        
-        # Key rate calculation
-        key_rate = effective_detection_rate * 0.5 * (1 - h_qber)
-        
-        # Mobile overhead is higher
-        ec_overhead = 1.5 * qber  # Higher error correction overhead
-        pa_overhead = 0.15  # Higher privacy amplification overhead
-        
-        final_key_rate = max(0, key_rate * (1 - ec_overhead - pa_overhead))
-        
-        # Scale by actual measurement count
-        if total_measurements < 1000:
-            final_key_rate *= (total_measurements / 1000)
-        
-        self.log_message(f"Mobile secure key rate: {final_key_rate:.0f} bps", "info")
+            self.log_message(f"Mobile secure key rate: {final_key_rate.mean():.0f} bps mean", "info")
         return final_key_rate
     
     def analyze_mobile_device_suitability(self, fidelity: float, detection_efficiency: float, 
                                         qber: float, secure_key_rate: float) -> int:
         """Analyze mobile device suitability for QKD with adjusted thresholds"""
         
-        score = 0
-        
-        # Fidelity score (adjusted for mobile devices)
-        if fidelity > 0.90:
-            score += 30
-        elif fidelity > 0.85:
-            score += 25
-        elif fidelity > 0.80:
-            score += 20
-        elif fidelity > 0.75:
-            score += 15
-        else:
-            score += 5
-        
-        # Detection efficiency score (adjusted thresholds)
-        if detection_efficiency > 0.80:
-            score += 25
-        elif detection_efficiency > 0.70:
-            score += 20
-        elif detection_efficiency > 0.60:
-            score += 15
-        else:
-            score += 10
-        
-        # QBER score (same thresholds)
-        if qber < 0.05:
-            score += 25
-        elif qber < 0.10:
-            score += 20
-        elif qber < 0.15:
-            score += 15
-        else:
-            score += 5
-        
-        # Key rate score (adjusted for mobile)
-        if secure_key_rate > 500:
-            score += 20
-        elif secure_key_rate > 250:
-            score += 15
-        elif secure_key_rate > 100:
-            score += 10
-        else:
-            score += 5
+        # Same QBER thresholds as lab devices; fidelity, efficiency and key rate adjusted for mobile
+        score = (
+            _bucket(self._MOBILE_FIDELITY_T, self._MOBILE_FIDELITY_S, fidelity) +
+            _bucket(self._MOBILE_DETECTION_T, self._MOBILE_DETECTION_S, detection_efficiency) +
+            _bucket(self._QBER_T, self._QBER_S, qber, side='right') +
+            _bucket(self._MOBILE_KEY_RATE_T, self._MOBILE_KEY_RATE_S, secure_key_rate)
+        )
         
-        return score
+        return int(score)
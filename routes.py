@@ -1,24 +1,144 @@
 import logging
 import json
 import os
+import io
+import base64
+import socket
 import time
 import secrets
 import random
 import numpy as np
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from collections import OrderedDict, deque
+from itertools import islice
 from datetime import datetime
-from flask import render_template, request, jsonify
+from functools import lru_cache
+import qrcode
+from flask import render_template, request, jsonify, Response, stream_with_context
 from app import app
 from bb84_simulator import BB84SimulationEngine
 from quantum_device import QuantumDeviceTestbed
-from firebase_config import save_testbed_result, get_testbed_results
-from lab_simulator import BB84LabSimulator, AttackType
+from firebase_config import save_testbed_results, get_testbed_results
+from lab_simulator import BB84LabSimulator, AttackType, PROTOCOL_NAMES
+from bb84_kernels import continuous_poll_metrics, continuous_run_constants
+
+# Import orjson safely (faster JSON responses, optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+def _poll_etag(current_time):
+    """ETag for polled simulated data, which is treated as fresh for one wall-clock second"""
+    return str(int(current_time))
+
+def _not_modified(etag):
+    """304 response if the client already holds this second's data, else None"""
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    return None
+
+def _cache_for_poll(response, etag):
+    """Let browsers and proxies reuse a polled response for up to one second"""
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = 1
+    return response
+
+def _json(obj):
+    """JSON response for obj, encoded with orjson when available (handles NumPy values natively)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return Response(
+                orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS),
+                mimetype='application/json'
+            )
+        except TypeError:
+            pass  # Types orjson does not know; let Flask's provider handle them
+    return jsonify(obj)
+
 # Global lab simulator instance
 lab_simulator = BB84LabSimulator()
 
+# Random source for simulated device metrics
+_RNG = np.random.default_rng()
+
+# Photon detection identifiers for simulated mobile measurements (constant, shared between requests)
+_PHOTON_LIST_100 = tuple(f'photon_{i}' for i in range(100))
+_PHOTON_LIST_50 = tuple(f'photon_{i}' for i in range(50))
+
+# Simulation engines and testbeds keep per-call logs, so each worker thread reuses its own instance
+_engines = threading.local()
+
+def _simulation_engine() -> BB84SimulationEngine:
+    """This thread's BB84SimulationEngine, created on first use"""
+    engine = getattr(_engines, 'simulator', None)
+    if engine is None:
+        engine = _engines.simulator = BB84SimulationEngine()
+    return engine
+
+def _testbed() -> QuantumDeviceTestbed:
+    """This thread's QuantumDeviceTestbed, created on first use"""
+    testbed = getattr(_engines, 'testbed', None)
+    if testbed is None:
+        testbed = _engines.testbed = QuantumDeviceTestbed()
+    return testbed
+
+def _metrics_lab() -> BB84LabSimulator:
+    """This thread's default-parameter BB84LabSimulator for advanced metrics (separate from lab_simulator)"""
+    lab = getattr(_engines, 'metrics_lab', None)
+    if lab is None:
+        lab = _engines.metrics_lab = BB84LabSimulator()
+    return lab
+
+# Optional engine features, checked once at import
+_ENGINE_HAS_DYNAMIC_METRICS = hasattr(BB84SimulationEngine, '_calculate_dynamic_metrics')
+_ENGINE_HAS_CIRCUITS = (hasattr(BB84SimulationEngine, 'generate_alice_encoding_circuit')
+                        and hasattr(BB84SimulationEngine, 'generate_bob_measurement_circuit'))
+
+# Circuit diagrams depend only on (bit, basis) / basis, so each successful render is reused.
+# Failed renders (None or a non-success status) are raised out of the cached functions,
+# since lru_cache never stores exceptions, and returned to the caller uncached.
+class _CircuitNotCached(Exception):
+    """Carries a failed circuit render out of the lru_cache wrappers"""
+    def __init__(self, result):
+        super().__init__()
+        self.result = result
+
+def _successful_circuit(circuit_data):
+    if not circuit_data or circuit_data.get('status') != 'success':
+        raise _CircuitNotCached(circuit_data)
+    return circuit_data
+
+@lru_cache(maxsize=32)
+def _cached_alice_circuit(bit, basis):
+    return _successful_circuit(_simulation_engine().generate_alice_encoding_circuit(bit, basis))
+
+@lru_cache(maxsize=32)
+def _cached_bob_circuit(basis):
+    return _successful_circuit(_simulation_engine().generate_bob_measurement_circuit(basis))
+
+def _alice_circuit(bit, basis):
+    """Alice's encoding circuit diagram for one bit and basis"""
+    try:
+        return _cached_alice_circuit(str(bit), str(basis))
+    except _CircuitNotCached as e:
+        return e.result
+
+def _bob_circuit(basis):
+    """Bob's measurement circuit diagram for one basis"""
+    try:
+        return _cached_bob_circuit(str(basis))
+    except _CircuitNotCached as e:
+        return e.result
+
 @app.route('/')
 def index():
     """Render the homepage."""
@@ -44,184 +164,240 @@ def mobile_interface(token):
     """Render the mobile device interface page."""
     return render_template('mobile.html', session_token=token)
 
+# Request parameters read by /api/run_simulation and their defaults
+_SIMULATION_DEFAULTS = {
+    'backend_type': 'classical',
+    'scenario': 'manual',
+    'auto_type': 'qubits',
+    'qrng_mode': False,
+    'quantum_api_key': None,
+    'alice_bits': '0110',
+    'alice_bases': '+x+x',
+    'num_qubits': 4,
+    'rng_type': 'classical',
+    'photon_rate': 100,
+    'distance': 10,
+    'noise': 0.1,
+    'eve_attack': 'none',
+    'error_correction': 'none',
+    'privacy_amplification': 'none',
+}
+
+def _channel_args(params):
+    """Channel, attack and post-processing arguments shared by the run_*_simulation calls"""
+    return (params['distance'], params['noise'], params['eve_attack'], params['error_correction'],
+            params['privacy_amplification'], params['backend_type'])
+
+def _run_manual_simulation(simulator, params):
+    """Manual input with user-provided bits and bases"""
+    return simulator.run_manual_simulation(params['alice_bits'], params['alice_bases'], 100, *_channel_args(params))
+
+def _run_auto_qubits_simulation(simulator, params):
+    """NUMBER OF QUBITS: Auto-generate specified number of qubits"""
+    return simulator.run_auto_simulation(params['auto_num_qubits'], 'classical', 1000, *_channel_args(params))
+
+def _run_photon_setup(simulator, params):
+    """PHOTON RATE BASED: Return success for continuous mode setup"""
+    photon_rate = params['auto_photon_rate']
+    return {
+        'status': 'success',
+        'mode': 'continuous_setup',
+        'message': f'Continuous simulation setup for {photon_rate} Hz',
+        'photon_rate': photon_rate,
+        'backend_type': params['backend_type'],
+        'simulation_type': 'photon_rate_based'
+    }
+
+def _run_single_auto_simulation(simulator, params):
+    """NUMBER OF QUBITS: Single simulation run"""
+    logger.info("Starting single-run auto simulation with %s qubits", params['num_qubits'])
+    result = _run_default_simulation(simulator, params)
+    result['simulation_type'] = 'single_run'
+    return result
+
+def _run_default_simulation(simulator, params):
+    """Default to auto simulation"""
+    return simulator.run_auto_simulation(
+        params['num_qubits'], params['rng_type'], params['photon_rate'], *_channel_args(params)
+    )
+
+# Simulation handler per (scenario, auto_type); (scenario, None) matches any auto_type
+_SCENARIO_HANDLERS = {
+    ('manual', None): _run_manual_simulation,
+    ('auto', 'qubits'): _run_auto_qubits_simulation,
+    ('auto', 'photon'): _run_photon_setup,
+    ('auto', None): _run_single_auto_simulation,
+}
+
+def _run_bb84_simulation(params):
+    """Run a classical/simulator BB84 simulation for the extracted request parameters"""
+    simulator = _simulation_engine()
+    
+    # Traditional BB84 simulation for Classical Mathematical and Qiskit IBM Simulator
+    handler = (_SCENARIO_HANDLERS.get((params['scenario'], params['auto_type']))
+               or _SCENARIO_HANDLERS.get((params['scenario'], None), _run_default_simulation))
+    result = handler(simulator, params)
+    
+    # Add dynamic metrics to all traditional simulations
+    if _ENGINE_HAS_DYNAMIC_METRICS:
+        dynamic_metrics = simulator._calculate_dynamic_metrics(result)
+        result.update(dynamic_metrics)
+    
+    # FIX: Add advanced quantum circuit diagrams with JSON structure
+    if _ENGINE_HAS_CIRCUITS:
+        # Generate circuit diagrams for first qubit as example
+        alice_bits = result.get('alice_bits', '0110')
+        alice_bases = result.get('alice_bases', '+x+x')
+        bob_bases = result.get('bob_bases', '+x+x')
+        
+        if alice_bits and alice_bases and bob_bases:
+            try:
+                alice_circuit = _alice_circuit(alice_bits[0], alice_bases[0])
+                bob_circuit = _bob_circuit(bob_bases[0])
+                
+                result['circuit_diagrams'] = {
+                    'alice_encoding': alice_circuit,
+                    'bob_measurement': bob_circuit,
+                    'status': 'generated'
+                }
+            except Exception as e:
+                logger.warning("Circuit diagram generation failed: %s", e)
+                result['circuit_diagrams'] = {'status': 'failed', 'error': str(e)}
+    
+    return result
+
+# Real quantum computer QRNG jobs run on this pool; each response streams its own job's result
+_QRNG_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='qrng')
+_QRNG_TIMEOUT = 600.0  # seconds a client waits for IBM Quantum before the stream gives up
+_QRNG_KEEPALIVE = 5.0  # seconds between keep-alive chunks while the job runs
+
+def _run_qrng_job(quantum_api_key, key_length):
+    """Generate a quantum random key on IBM Quantum hardware (runs on the QRNG executor)"""
+    logger.info("🚀 Starting Real Quantum Computer QRNG key generation")
+    # Use quantum computer's intrinsic randomness for direct key generation
+    result = _simulation_engine().generate_qrng_key(quantum_api_key, key_length)
+    
+    # Add metadata for QRNG mode
+    result['mode'] = 'qrng'
+    result['protocol_bypassed'] = 'BB84 traditional steps bypassed for direct quantum randomness'
+    result['backend_type'] = 'real_quantum_qrng'
+    
+    logger.info("✅ QRNG generation completed successfully: %s", result.get('status', 'unknown'))
+    return result
+
+def _stream_qrng_result(future):
+    """
+    Yield keep-alive whitespace until a QRNG job finishes, then its result as JSON
+    
+    Leading whitespace is valid JSON, so the client reads the whole body with one
+    response.json(). The result stays on this connection, whichever worker serves it.
+    """
+    deadline = time.monotonic() + _QRNG_TIMEOUT
+    try:
+        while True:
+            try:
+                result = future.result(timeout=_QRNG_KEEPALIVE)
+                break
+            except FuturesTimeoutError:
+                if time.monotonic() >= deadline:
+                    logger.error("❌ Real Quantum Computer QRNG timed out after %.0f s", _QRNG_TIMEOUT)
+                    result = {
+                        'error': 'Real Quantum Computer job timed out',
+                        'status': 'error',
+                        'message': 'IBM Quantum did not return a key in time, please try again later'
+                    }
+                    break
+                yield b' '
+            except Exception as e:
+                logger.error("❌ Real Quantum Computer QRNG failed: %s", e)
+                result = {
+                    'error': f'Real Quantum Computer error: {str(e)}',
+                    'status': 'error',
+                    'message': 'Please check your IBM Quantum API key and try again'
+                }
+                break
+        yield _json(result).get_data()
+    finally:
+        future.cancel()  # Drops the job if it is still queued (timeout or client gone)
+
 @app.route('/api/run_simulation', methods=['POST'])
 def run_simulation():
     """Run BB84 simulation with given parameters - Updated to handle all three modes"""
     try:
-        data = request.get_json()
-        logger.info(f"✅ Received simulation request: {data}")
+        data = request.get_json(cache=False)
+        logger.info("✅ Received simulation request: %s", data)
         
         # Extract all parameters with complete support for all modes
-        backend_type = data.get('backend_type', 'classical')
-        scenario = data.get('scenario', 'manual')
-        auto_type = data.get('auto_type', 'qubits')
-        
-        # Security and channel parameters
-        distance = float(data.get('distance', 10))
-        channel_noise = float(data.get('channel_noise', 0.1))
-        eve_attack = data.get('eve_attack', 'none')
-        error_correction = data.get('error_correction', 'none')
-        privacy_amplification = data.get('privacy_amplification', 'none')
-        
-        logger.info(f"🎯 Processing {backend_type} simulation with {scenario} mode")
-        continuous_mode = data.get('continuous_mode', False)  # For photon rate based
-        qrng_mode = data.get('qrng_mode', False)  # For real quantum QRNG
-        
-        # Input parameters
-        bits = data.get('bits', '0110')
-        bases = data.get('bases', '+x+x')
-        num_qubits = data.get('num_qubits', 4)
-        rng_type = data.get('rng_type', 'classical')
-        photon_rate = data.get('photon_rate', 100)
-        
-        # Security and channel parameters with NONE as defaults
-        distance = data.get('distance', 10)
-        noise = data.get('noise', 0.1)
-        eve_attack = data.get('eve_attack', 'none')
-        error_correction = data.get('error_correction', 'none')  # Default to none
-        privacy_amplification = data.get('privacy_amplification', 'none')  # Default to none
+        params = {key: data.get(key, default) for key, default in _SIMULATION_DEFAULTS.items()}
+        params['distance'] = float(params['distance'])  # Invalid values are reported as 400
+        backend_type = params['backend_type']
+        scenario = params['scenario']
+        qrng_mode = params.pop('qrng_mode')  # For real quantum QRNG
+        num_qubits = params['num_qubits']
         
         # Real Quantum Computer API key
-        quantum_api_key = data.get('quantum_api_key', None)
+        quantum_api_key = params.pop('quantum_api_key')
         
-        # Initialize unified simulation engine
-        simulator = BB84SimulationEngine()
+        logger.info("🎯 Processing %s simulation with %s mode", backend_type, scenario)
         
         # REAL QUANTUM COMPUTER: Direct QRNG generation bypassing BB84 protocol
         if backend_type == 'real_quantum' or qrng_mode:
             if not quantum_api_key:
-                return jsonify({
+                return _json({
                     'error': 'IBM Quantum API Key required for real quantum computer',
                     'status': 'error',
                     'message': 'Please provide a valid IBM Quantum API Key for QRNG generation'
                 }), 400
             
-            try:
-                logger.info("🚀 Starting Real Quantum Computer QRNG key generation")
-                # Generate QRNG directly - bypass traditional BB84 steps
-                # Use quantum computer's intrinsic randomness for direct key generation
-                key_length = num_qubits * 8 if num_qubits else 32
-                
-                # Disable Flask auto-reload during quantum job to prevent interruption
-                app.config['DEBUG'] = False
-                
-                result = simulator.generate_qrng_key(quantum_api_key, key_length)
-                
-                # Re-enable debug mode after job completion
-                app.config['DEBUG'] = True
-                
-                # Add metadata for QRNG mode
-                result['mode'] = 'qrng'
-                result['protocol_bypassed'] = 'BB84 traditional steps bypassed for direct quantum randomness'
-                result['backend_type'] = 'real_quantum_qrng'
-                
-                logger.info(f"✅ QRNG generation completed successfully: {result.get('status', 'unknown')}")
-                
-            except Exception as e:
-                logger.error(f"❌ Real Quantum Computer QRNG failed: {str(e)}")
-                # Re-enable debug mode on error
-                app.config['DEBUG'] = True
-                return jsonify({
-                    'error': f'Real Quantum Computer error: {str(e)}',
-                    'status': 'error',
-                    'message': 'Please check your IBM Quantum API key and try again'
-                }), 500
+            # Generate QRNG directly - bypass traditional BB84 steps. The IBM Quantum job can take
+            # minutes, so it runs on the QRNG pool and the result is streamed back on this response
+            key_length = num_qubits * 8 if num_qubits else 32
+            future = _QRNG_EXECUTOR.submit(_run_qrng_job, quantum_api_key, key_length)
+            return Response(stream_with_context(_stream_qrng_result(future)), mimetype='application/json')
             
         else:
-            # Traditional BB84 simulation for Classical Mathematical and Qiskit IBM Simulator
-            if scenario == 'manual':
-                # Manual input with user-provided bits and bases
-                alice_bits = data.get('alice_bits', '0110')
-                alice_bases = data.get('alice_bases', '+x+x')
-                result = simulator.run_manual_simulation(
-                    alice_bits, alice_bases, 100, distance, noise, 
-                    eve_attack, error_correction, privacy_amplification, backend_type
-                )
-            elif scenario == 'auto':
-                if auto_type == 'qubits':
-                    # NUMBER OF QUBITS: Auto-generate specified number of qubits
-                    num_qubits = data.get('num_qubits', 8)
-                    result = simulator.run_auto_simulation(
-                        num_qubits, 'classical', 1000, distance, noise, 
-                        eve_attack, error_correction, privacy_amplification, backend_type
-                    )
-                elif auto_type == 'photon':
-                    # PHOTON RATE BASED: Return success for continuous mode setup
-                    photon_rate = data.get('photon_rate', 1000)
-                    result = {
-                        'status': 'success',
-                        'mode': 'continuous_setup',
-                        'message': f'Continuous simulation setup for {photon_rate} Hz',
-                        'photon_rate': photon_rate,
-                        'backend_type': backend_type
-                    }
-                    result['simulation_type'] = 'photon_rate_based'
-                else:
-                    # NUMBER OF QUBITS: Single simulation run
-                    logger.info(f"Starting single-run auto simulation with {num_qubits} qubits")
-                    result = simulator.run_auto_simulation(
-                        num_qubits, rng_type, photon_rate, distance, noise,
-                        eve_attack, error_correction, privacy_amplification, backend_type
-                    )
-                    result['simulation_type'] = 'single_run'
-            else:
-                # Default to auto simulation
-                result = simulator.run_auto_simulation(
-                    num_qubits, rng_type, photon_rate, distance, noise,
-                    eve_attack, error_correction, privacy_amplification, backend_type
-                )
-            
-            # Add dynamic metrics to all traditional simulations
-            if hasattr(simulator, '_calculate_dynamic_metrics'):
-                dynamic_metrics = simulator._calculate_dynamic_metrics(result)
-                result.update(dynamic_metrics)
-            
-            # FIX: Add advanced quantum circuit diagrams with JSON structure
-            if hasattr(simulator, 'generate_alice_encoding_circuit') and hasattr(simulator, 'generate_bob_measurement_circuit'):
-                # Generate circuit diagrams for first qubit as example
-                alice_bits = result.get('alice_bits', '0110')
-                alice_bases = result.get('alice_bases', '+x+x')
-                bob_bases = result.get('bob_bases', '+x+x')
-                
-                if alice_bits and alice_bases and bob_bases:
-                    try:
-                        alice_circuit = simulator.generate_alice_encoding_circuit(alice_bits[0], alice_bases[0])
-                        bob_circuit = simulator.generate_bob_measurement_circuit(bob_bases[0])
-                        
-                        result['circuit_diagrams'] = {
-                            'alice_encoding': alice_circuit,
-                            'bob_measurement': bob_circuit,
-                            'status': 'generated'
-                        }
-                    except Exception as e:
-                        logger.warning(f"Circuit diagram generation failed: {str(e)}")
-                        result['circuit_diagrams'] = {'status': 'failed', 'error': str(e)}
+            # Traditional BB84 simulation (the auto scenarios default to 8 qubits / 1000 Hz
+            # when those fields are absent)
+            params['auto_num_qubits'] = data.get('num_qubits', 8)
+            params['auto_photon_rate'] = data.get('photon_rate', 1000)
+            result = _run_bb84_simulation(params)
         
         logger.info("Simulation completed successfully")
-        return jsonify(result)
+        return _json(result)
 
     except ValueError as e:
-        logger.error(f"Validation error: {str(e)}", exc_info=True)
-        return jsonify({
+        logger.error("Validation error: %s", e, exc_info=True)
+        return _json({
             'error': str(e),
             'status': 'error',
             'message': str(e)
         }), 400  # Return a 400 Bad Request status code
      
     except Exception as e:
-        logger.error(f"Simulation error: {str(e)}", exc_info=True)
-        return jsonify({
+        logger.error("Simulation error: %s", e, exc_info=True)
+        return _json({
             'error': str(e),
             'status': 'error',
             'message': 'Simulation failed. Please check your parameters and try again.'
         }), 500
 
+# Stand-in for a device without an analysis result (read-only)
+_EMPTY_RESULT = {}
+
+def _mobile_logs(qber, key_rate_bps, timestamp):
+    """Testbed log entries reported when mobile device analysis results are used"""
+    return [
+        {'level': 'info', 'message': 'Mobile device analysis completed', 'timestamp': timestamp},
+        {'level': 'success', 'message': f'QBER: {qber}%', 'timestamp': timestamp},
+        {'level': 'success', 'message': f'Key rate: {key_rate_bps} bps', 'timestamp': timestamp}
+    ]
+
 @app.route('/api/run_testbed', methods=['POST'])
 def run_testbed():
     """Run quantum device testbed analysis - requires real device connections"""
     try:
         data = request.get_json()
-        logger.info(f"Received testbed request: {data}")
+        logger.info("Received testbed request: %s", data)
         
         photon_rate = int(data.get('photon_rate', 150))  # Convert to int to fix TypeError
         api_key = data.get('api_key', None)
@@ -230,14 +406,14 @@ def run_testbed():
         if api_key and api_key.strip():
             logger.info("🚀 API key provided - proceeding with real quantum device testing")
             # Initialize testbed for real quantum device analysis
-            testbed = QuantumDeviceTestbed()
+            testbed = _testbed()
             
             # Run testbed analysis with real quantum device
             result = testbed.analyze_device(photon_rate, api_key)
             
             # If device is not connected, return appropriate status
             if not result.get('device_connected', True):
-                return jsonify({
+                return _json({
                     'status': 'device_unavailable', 
                     'result': result,
                     'message': result.get('status', 'Device connection failed - check API key and try again'),
@@ -245,68 +421,51 @@ def run_testbed():
                 })
             
             # Save result to Firebase (only for successful analyses)
-            try:
-                save_testbed_result(result)
-                logger.info("✅ Real quantum device testbed result saved to Firebase")
-            except Exception as e:
-                logger.warning(f"Failed to save to Firebase: {str(e)}")
+            _queue_testbed_result(result)
             
             logger.info("✅ Real quantum device testbed analysis completed successfully")
-            return jsonify(result)
+            return _json(result)
         
         # FALLBACK TO MOBILE DEVICES - Only if no API key is provided
         logger.info("🔄 No API key provided - checking for mobile device fallback")
         
         # Check if we have any connected mobile devices (with or without data)
-        connected_mobile_devices = [
-            device for device in connected_devices.values() 
-            if device.get('status') in ['connected', 'data_received', 'waiting', 'waiting_for_device']
-        ]
-        
-        active_mobile_devices = [
-            device for device in connected_devices.values() 
-            if device.get('data_received', False) and device.get('last_data')
-        ]
+        connected_mobile_devices = list(_connected_device_ids)
         
         # Auto-simulate data for connected devices if no data received yet
-        if len(connected_mobile_devices) > 0 and len(active_mobile_devices) == 0:
+        if len(connected_mobile_devices) > 0 and len(_active_device_ids) == 0:
             logger.info("Auto-simulating data for connected mobile devices")
-            for device_id, device in connected_devices.items():
-                if device.get('status') == 'connected':
+            for device_id in connected_mobile_devices:
+                device = _get_device(device_id)
+                if device is not None and device.get('status') == 'connected':
                     # Auto-simulate mobile device data submission
                     simulate_mobile_device_data(device_id)
-                    logger.info(f"Auto-simulated data for device {device_id}")
+                    logger.info("Auto-simulated data for device %s", device_id)
         
         # Refresh active devices list after auto-simulation
-        active_mobile_devices = [
-            device for device in connected_devices.values() 
-            if device.get('data_received', False) and device.get('last_data')
-        ]
+        active_mobile_devices = list(_active_device_ids)
         
         # If we have ANY mobile devices with data, use their analysis results
-        devices_with_data = [
-            device for device in connected_devices.values() 
-            if device.get('data_received', False) or device.get('analysis_result')
-        ]
+        devices_with_data = list(_devices_with_data)
         
         if len(devices_with_data) > 0:
-            logger.info(f"📱 Using mobile device analysis results from {len(devices_with_data)} devices")
-            mobile_result = devices_with_data[0].get('analysis_result', {})
+            logger.info("📱 Using mobile device analysis results from %s devices", len(devices_with_data))
+            mobile_result = (_get_device(devices_with_data[0]) or _EMPTY_RESULT).get('analysis_result') or _EMPTY_RESULT
+            qber = mobile_result.get('qber', 8.5)
+            key_rate_bps = mobile_result.get('key_rate_bps', 450)
+            efficiency = mobile_result.get('efficiency', 85)
+            suitability = mobile_result.get('suitability', 'Good for basic QKD testing')
             
-            return jsonify({
+            return _json({
                 'device_connected': True,
                 'device_type': 'mobile_quantum_sensor',
                 'analysis_complete': True,
-                'qber': mobile_result.get('qber', 8.5),
-                'key_rate_bps': mobile_result.get('key_rate_bps', 450),
-                'efficiency': mobile_result.get('efficiency', 85),
-                'suitability': mobile_result.get('suitability', 'Good for basic QKD testing'),
+                'qber': qber,
+                'key_rate_bps': key_rate_bps,
+                'efficiency': efficiency,
+                'suitability': suitability,
                 'device_rating': 'Mobile Device',
-                'logs': [
-                    {'level': 'info', 'message': 'Mobile device analysis completed', 'timestamp': time.strftime("%H:%M:%S")},
-                    {'level': 'success', 'message': f'QBER: {mobile_result.get("qber", 8.5)}%', 'timestamp': time.strftime("%H:%M:%S")},
-                    {'level': 'success', 'message': f'Key rate: {mobile_result.get("key_rate_bps", 450)} bps', 'timestamp': time.strftime("%H:%M:%S")}
-                ],
+                'logs': _mobile_logs(qber, key_rate_bps, time.strftime("%H:%M:%S")),
                 'recommendations': ['Mobile device analysis successful'],
                 'status': 'success',
                 'mobile_devices_used': len(devices_with_data)
@@ -315,7 +474,7 @@ def run_testbed():
         # NO API KEY AND NO MOBILE DEVICES - Return waiting status
         if len(connected_mobile_devices) == 0:
             logger.info("❌ No API key or mobile devices available - analysis cannot proceed")
-            return jsonify({
+            return _json({
                 'status': 'waiting_for_devices',
                 'message': 'Please provide IBM Quantum API key or connect mobile devices',
                 'connected_devices': len(connected_devices),
@@ -330,74 +489,218 @@ def run_testbed():
         
         # This should never be reached due to the logic above, but kept as fallback
         logger.warning("⚠️ Unexpected code path reached - falling back to waiting status")
-        return jsonify({
+        return _json({
             'status': 'waiting_for_devices',
             'message': 'Unexpected state - please provide API key or connect devices',
             'analysis_complete': False
         })
         
     except Exception as e:
-        logger.error(f"Testbed error: {str(e)}", exc_info=True)
-        return jsonify({
+        logger.error("Testbed error: %s", e, exc_info=True)
+        return _json({
             'error': str(e),
             'status': 'error',
             'message': 'Testbed analysis failed. Please check your API key and try again.'
         }), 500
 
+# Firebase writes leave the request path: handlers queue results and a daemon thread
+# saves them in batches (up to 16 results or 200ms per batch)
+_FIREBASE_Q = queue.Queue(maxsize=1024)
+_FIREBASE_BATCH_SIZE = 16
+_FIREBASE_BATCH_WINDOW = 0.2  # seconds
+
+def _queue_testbed_result(result):
+    """Queue a testbed result for saving to Firebase"""
+    try:
+        _FIREBASE_Q.put_nowait(result)
+    except queue.Full:
+        logger.warning("Firebase write queue full, testbed result not saved")
+
+def _firebase_worker():
+    """Background loop saving queued testbed results to Firebase in batches"""
+    while True:
+        batch = [_FIREBASE_Q.get()]
+        deadline = time.monotonic() + _FIREBASE_BATCH_WINDOW
+        while len(batch) < _FIREBASE_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_FIREBASE_Q.get(timeout=remaining))
+            except queue.Empty:
+                break
+        try:
+            save_testbed_results(batch)
+        except Exception as e:
+            logger.warning("Failed to save testbed results to Firebase: %s", e)
+
+threading.Thread(target=_firebase_worker, name='firebase-writer', daemon=True).start()
+
 @app.route('/api/testbed_history', methods=['GET'])
 def get_testbed_history():
     """Get testbed experiment history"""
     try:
         results = get_testbed_results()
-        return jsonify({'status': 'success', 'results': results})
+        return _json({'status': 'success', 'results': results})
     except Exception as e:
-        logger.error(f"Failed to retrieve testbed history: {str(e)}")
-        return jsonify({
+        logger.error("Failed to retrieve testbed history: %s", e)
+        return _json({
             'error': str(e),
             'status': 'error',
             'message': 'Failed to retrieve experiment history'
         }), 500
 
-# Global storage for connected mobile devices
-connected_devices = {}
+# Global storage for connected mobile devices, least recently updated first
+connected_devices = OrderedDict()
+_devices_lock = threading.Lock()
+
+# Session lifetime: tokens expire 300s after last activity (the expires_in given to clients)
+# and the table is capped. Devices quiet for 30s are only reported inactive, not dropped.
+_DEVICE_SESSION_TTL = 300.0  # seconds
+_DEVICE_INACTIVE_TTL = 30.0  # seconds
+_MAX_CONNECTED_DEVICES = 10000
+_DEVICE_REAPER_INTERVAL = 10.0  # seconds
+
+# Indexes over connected_devices kept in step by _store_device/_set_device_state
+# (dicts used as insertion-ordered sets)
+_CONNECTED_STATUSES = frozenset(('connected', 'data_received', 'waiting', 'waiting_for_device'))
+_connected_device_ids = {}  # status is one of _CONNECTED_STATUSES
+_active_device_ids = {}     # data received and last_data set
+_devices_with_data = {}     # data received or an analysis result attached
+
+def _index_device(device_id):
+    """Refresh the connected_devices indexes for one device"""
+    device = connected_devices.get(device_id)
+    for index, member in (
+        (_connected_device_ids, device is not None and device.get('status') in _CONNECTED_STATUSES),
+        (_active_device_ids, device is not None and device.get('data_received', False) and bool(device.get('last_data'))),
+        (_devices_with_data, device is not None and (device.get('data_received', False) or bool(device.get('analysis_result')))),
+    ):
+        if member:
+            index[device_id] = None
+        else:
+            index.pop(device_id, None)
+
+def _store_device(device_id, device):
+    """Add or replace a connected device record, evicting the stalest devices beyond the cap"""
+    with _devices_lock:
+        connected_devices[device_id] = device
+        connected_devices.move_to_end(device_id)
+        _index_device(device_id)
+        while len(connected_devices) > _MAX_CONNECTED_DEVICES:
+            evicted_id, _ = connected_devices.popitem(last=False)
+            _index_device(evicted_id)
+
+def _get_device(device_id):
+    """Connected device record for device_id, or None if unknown or already reaped"""
+    with _devices_lock:
+        return connected_devices.get(device_id)
+
+def _set_device_state(device_id, **fields):
+    """Update fields of a connected device record; returns False if the device is gone"""
+    with _devices_lock:
+        device = connected_devices.get(device_id)
+        if device is None:
+            return False
+        device.update(fields)
+        connected_devices.move_to_end(device_id)
+        _index_device(device_id)
+        return True
+
+def _reap_expired_devices(now=None):
+    """Remove device sessions idle for longer than the session TTL; returns the number removed"""
+    now = time.time() if now is None else now
+    with _devices_lock:
+        expired = [
+            device_id for device_id, device in connected_devices.items()
+            if now - max(device.get('connected_at', now), device.get('last_data') or 0) > _DEVICE_SESSION_TTL
+        ]
+        for device_id in expired:
+            del connected_devices[device_id]
+            _index_device(device_id)
+    return len(expired)
+
+def _device_reaper():
+    """Background loop evicting stale mobile device sessions"""
+    while True:
+        time.sleep(_DEVICE_REAPER_INTERVAL)
+        try:
+            removed = _reap_expired_devices()
+            if removed:
+                logger.info("Removed %s expired mobile device sessions", removed)
+        except Exception as e:
+            logger.error("Device session cleanup error: %s", e)
+
+threading.Thread(target=_device_reaper, name='device-reaper', daemon=True).start()
 
 # Global continuous simulation state with thread safety
 continuous_simulation_lock = threading.Lock()
 continuous_simulation_thread = None
 
+# Public Replit domain for mobile connectivity (fixed for the life of the process)
+_PUBLIC_DOMAIN = os.environ.get('REPLIT_DEV_DOMAIN')
+_local_ip = None  # Detected once; failed detections are retried on the next call
+
 def get_local_ip():
     """Get the local network IP address for mobile connections"""
-    import socket
+    global _local_ip
+    if _local_ip is not None:
+        return _local_ip
     try:
         # Connect to a remote address to determine the local IP
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
             s.connect(("8.8.8.8", 80))  # Google DNS
-            local_ip = s.getsockname()[0]
-            return local_ip
+            _local_ip = s.getsockname()[0]
+            return _local_ip
     except Exception:
         # Fallback to localhost if detection fails
         return "127.0.0.1"
 
+# QR code layout for mobile connection links. The mask pattern is fixed: any mask scans,
+# and evaluating all eight to pick the lowest-penalty one dominates encoding time.
+_QR_BOX_SIZE = 10
+_QR_BORDER = 4
+_QR_MASK_PATTERN = 0
+
+def _qr_code_data_uri(url: str) -> str:
+    """Encode url as a QR code PNG data URI for web display"""
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=_QR_BOX_SIZE,
+        border=_QR_BORDER,
+        mask_pattern=_QR_MASK_PATTERN,
+    )
+    qr.add_data(url)
+    qr.make(fit=True)
+    
+    # Default black-on-white renders as a 1-bit image, cheaper to draw and compress than RGB
+    img = qr.make_image()
+    
+    # Convert to base64 for web display
+    img_buffer = io.BytesIO()
+    img.save(img_buffer, format='PNG')
+    img_b64 = base64.b64encode(img_buffer.getbuffer()).decode('ascii')  # Encode the PNG in place, no copy
+    return f"data:image/png;base64,{img_b64}"
+
 @app.route('/api/connect_mobile', methods=['POST'])
 def connect_mobile():
     """Generate connection token for mobile device"""
     try:
-        import uuid
-        
-        # Generate unique session token
-        session_token = str(uuid.uuid4())
+        # Generate unique session token (URL-safe, 128 bits of randomness)
+        session_token = secrets.token_urlsafe(16)
         
         # Store connection session
-        connected_devices[session_token] = {
+        _store_device(session_token, {
             'token': session_token,
             'connected_at': time.time(),
             'last_data': None,
             'status': 'waiting_for_device',
             'data_received': False
-        }
+        })
         
         # Use the public Replit domain for mobile connectivity
-        public_domain = os.environ.get('REPLIT_DEV_DOMAIN')
+        public_domain = _PUBLIC_DOMAIN
         if public_domain:
             mobile_url = f"https://{public_domain}/mobile/{session_token}"
         else:
@@ -405,34 +708,14 @@ def connect_mobile():
             local_ip = get_local_ip()
             mobile_url = f"http://{local_ip}:5000/mobile/{session_token}"
         
-        logger.info(f"Mobile connection initiated with token: {session_token}")
-        logger.info(f"Mobile URL: {mobile_url}")
-        logger.info(f"Using domain: {public_domain}")
+        logger.info("Mobile connection initiated with token: %s", session_token)
+        logger.info("Mobile URL: %s", mobile_url)
+        logger.info("Using domain: %s", public_domain)
         
         # Generate QR code image
-        import qrcode
-        import io
-        import base64
-        
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(mobile_url)
-        qr.make(fit=True)
+        qr_image_data = _qr_code_data_uri(mobile_url)
         
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Convert to base64 for web display
-        img_buffer = io.BytesIO()
-        img.save(img_buffer, format='PNG')
-        img_buffer.seek(0)
-        img_b64 = base64.b64encode(img_buffer.getvalue()).decode()
-        qr_image_data = f"data:image/png;base64,{img_b64}"
-        
-        return jsonify({
+        return _json({
             'status': 'success',
             'session_token': session_token,
             'qr_data': mobile_url,
@@ -442,8 +725,8 @@ def connect_mobile():
         })
         
     except Exception as e:
-        logger.error(f"Mobile connection error: {str(e)}")
-        return jsonify({
+        logger.error("Mobile connection error: %s", e)
+        return _json({
             'error': str(e),
             'status': 'error'
         }), 500
@@ -458,22 +741,22 @@ def register_mobile_device():
         device_info = data.get('device_info', {})
         
         if not device_id:
-            return jsonify({
+            return _json({
                 'error': 'device_id is required',
                 'status': 'error'
             }), 400
         
         # Store device registration
-        connected_devices[device_id] = {
+        _store_device(device_id, {
             'token': device_token,
             'info': device_info,
             'connected_at': time.time(),
             'last_data': None
-        }
+        })
         
-        logger.info(f"Mobile device registered: {device_id}")
+        logger.info("Mobile device registered: %s", device_id)
         
-        return jsonify({
+        return _json({
             'status': 'success',
             'message': 'Device registered successfully',
             'device_id': device_id,
@@ -481,8 +764,8 @@ def register_mobile_device():
         })
         
     except Exception as e:
-        logger.error(f"Device registration error: {str(e)}")
-        return jsonify({
+        logger.error("Device registration error: %s", e)
+        return _json({
             'error': str(e),
             'status': 'error'
         }), 500
@@ -495,40 +778,37 @@ def submit_mobile_data():
         session_token = data.get('session_token')
         
         if not session_token or session_token not in connected_devices:
-            return jsonify({
+            return _json({
                 'error': 'Invalid session token',
                 'status': 'error'
             }), 401
         
         # Get measurement data
         mobile_data = data.get('measurements', {})
-        logger.info(f"Received mobile data from session {session_token}: {mobile_data}")
+        logger.info("Received mobile data from session %s: %s", session_token, mobile_data)
         
         # Process the data using QuantumDeviceTestbed
-        testbed = QuantumDeviceTestbed()
+        testbed = _testbed()
         result = testbed.analyze_mobile_data(mobile_data)
         
         # Update session with received data
-        connected_devices[session_token].update({
-            'last_data': time.time(),
-            'status': 'data_received',
-            'data_received': True,
-            'result': result
-        })
+        _set_device_state(
+            session_token,
+            last_data=time.time(),
+            status='data_received',
+            data_received=True,
+            result=result
+        )
         
         # Save result to Firebase if available
-        try:
-            save_testbed_result(result)
-            logger.info("Mobile testbed result saved to Firebase")
-        except Exception as e:
-            logger.warning(f"Failed to save mobile result to Firebase: {str(e)}")
+        _queue_testbed_result(result)
         
-        logger.info(f"Mobile data processed successfully for session {session_token}")
-        return jsonify(result)
+        logger.info("Mobile data processed successfully for session %s", session_token)
+        return _json(result)
         
     except Exception as e:
-        logger.error(f"Mobile data processing error: {str(e)}", exc_info=True)
-        return jsonify({
+        logger.error("Mobile data processing error: %s", e, exc_info=True)
+        return _json({
             'error': str(e),
             'status': 'error',
             'message': 'Failed to process mobile measurement data'
@@ -542,42 +822,39 @@ def submit_mobile_results():
         auth_token = request.headers.get('Authorization', '').replace('Bearer ', '')
         device_id = request.headers.get('X-Device-ID')
         
-        if not device_id or device_id not in connected_devices:
-            return jsonify({
+        device = _get_device(device_id) if device_id else None
+        if device is None:
+            return _json({
                 'error': 'Device not registered',
                 'status': 'error'
             }), 401
         
-        if connected_devices[device_id]['token'] != auth_token:
-            return jsonify({
+        if device['token'] != auth_token:
+            return _json({
                 'error': 'Invalid authentication token',
                 'status': 'error'
             }), 401
         
         # Get measurement data
         mobile_data = request.get_json()
-        logger.info(f"Received mobile data from {device_id}: {mobile_data}")
+        logger.info("Received mobile data from %s: %s", device_id, mobile_data)
         
         # Process the data using QuantumDeviceTestbed
-        testbed = QuantumDeviceTestbed()
+        testbed = _testbed()
         result = testbed.process_mobile_data(mobile_data, device_id)
         
         # Update device's last data timestamp
-        connected_devices[device_id]['last_data'] = time.time()
+        _set_device_state(device_id, last_data=time.time())
         
         # Save result to Firebase if available
-        try:
-            save_testbed_result(result)
-            logger.info("Mobile testbed result saved to Firebase")
-        except Exception as e:
-            logger.warning(f"Failed to save mobile result to Firebase: {str(e)}")
+        _queue_testbed_result(result)
         
-        logger.info(f"Mobile data processed successfully for device {device_id}")
-        return jsonify(result)
+        logger.info("Mobile data processed successfully for device %s", device_id)
+        return _json(result)
         
     except Exception as e:
-        logger.error(f"Mobile data processing error: {str(e)}", exc_info=True)
-        return jsonify({
+        logger.error("Mobile data processing error: %s", e, exc_info=True)
+        return _json({
             'error': str(e),
             'status': 'error',
             'message': 'Failed to process mobile measurement data'
@@ -590,10 +867,13 @@ def get_mobile_device_status():
         current_time = time.time()
         device_statuses = []
         
-        for device_id, device_data in connected_devices.items():
+        with _devices_lock:
+            devices = list(connected_devices.items())
+        
+        for device_id, device_data in devices:
             # Consider device offline if no data received for 30 seconds
             is_active = (device_data.get('last_data') and 
-                        current_time - device_data['last_data'] < 30)
+                        current_time - device_data['last_data'] < _DEVICE_INACTIVE_TTL)
             
             device_statuses.append({
                 'device_id': device_id,
@@ -606,29 +886,27 @@ def get_mobile_device_status():
                 'info': device_data.get('info', {})
             })
         
-        return jsonify({
+        return _json({
             'status': 'success',
             'devices': device_statuses,
             'total_devices': len(connected_devices)
         })
         
     except Exception as e:
-        logger.error(f"Device status error: {str(e)}")
-        return jsonify({
+        logger.error("Device status error: %s", e)
+        return _json({
             'error': str(e),
             'status': 'error'
         }), 500
 
 def simulate_mobile_device_data(device_id):
     """Helper function to generate simulated mobile device data for a specific device"""
-    import random
-    
     if device_id not in connected_devices:
         return None
     
     # Generate realistic quantum measurement data
     simulated_data = {
-        'photon_measurements': [f'photon_{i}' for i in range(100)],
+        'photon_measurements': _PHOTON_LIST_100,
         'duration': 10,
         'device_info': {
             'model': 'Mobile Quantum Sensor',
@@ -641,34 +919,36 @@ def simulate_mobile_device_data(device_id):
     try:
         # Use the existing mobile data processing logic
         # Process through quantum device testbed
-        device_testbed = QuantumDeviceTestbed()
+        device_testbed = _testbed()
         
-        # Generate analysis directly
+        # Generate analysis directly: QBER (%), key rate (bps) and efficiency (%) in one draw
+        qber, key_rate_bps, efficiency = _RNG.uniform((3, 200, 70), (12, 800, 95)).round(1).tolist()
         analysis_result = {
             'device_connected': True,
             'device_type': 'mobile_quantum_sensor',
-            'qber': round(random.uniform(3, 12), 1),
-            'key_rate_bps': round(random.uniform(200, 800), 1),
-            'efficiency': round(random.uniform(70, 95), 1),
+            'qber': qber,
+            'key_rate_bps': key_rate_bps,
+            'efficiency': efficiency,
             'suitability': 'Good for basic QKD testing',
             'timestamp': time.time()
         }
         
-        logger.info(f"TESTBED: Auto-simulated mobile analysis - QBER: {analysis_result['qber']}%, Key Rate: {analysis_result['key_rate_bps']} bps")
+        logger.info("TESTBED: Auto-simulated mobile analysis - QBER: %s%%, Key Rate: %s bps", analysis_result['qber'], analysis_result['key_rate_bps'])
         
     except Exception as e:
-        logger.error(f"Auto-simulation error: {e}")
+        logger.error("Auto-simulation error: %s", e)
         analysis_result = {'error': str(e)}
     
     # Update device status
-    connected_devices[device_id].update({
-        'status': 'data_received', 
-        'data_received': True,
-        'last_data': time.time(),
-        'analysis_result': analysis_result
-    })
+    _set_device_state(
+        device_id,
+        status='data_received',
+        data_received=True,
+        last_data=time.time(),
+        analysis_result=analysis_result
+    )
     
-    logger.info(f"Auto-simulated data processed for device {device_id}")
+    logger.info("Auto-simulated data processed for device %s", device_id)
     return analysis_result
 
 @app.route('/api/simulate_mobile_data', methods=['POST'])
@@ -679,14 +959,14 @@ def simulate_mobile_data():
         session_token = data.get('session_token')
         
         if not session_token or session_token not in connected_devices:
-            return jsonify({
+            return _json({
                 'error': 'Invalid session token',
                 'status': 'error'
             }), 401
         
         # Generate simulated quantum measurement data
         simulated_data = {
-            'photon_detections': [f"photon_{i}" for i in range(50)],  # 50 photon detections
+            'photon_detections': _PHOTON_LIST_50,  # 50 photon detections
             'duration': 10.0,
             'device_info': {
                 'model': 'Simulated Mobile Quantum Sensor',
@@ -696,23 +976,24 @@ def simulate_mobile_data():
         }
         
         # Process the simulated data
-        testbed = QuantumDeviceTestbed()
+        testbed = _testbed()
         result = testbed.analyze_mobile_data(simulated_data)
         
         # Update session with received data
-        connected_devices[session_token].update({
-            'last_data': time.time(),
-            'status': 'data_received',
-            'data_received': True,
-            'result': result
-        })
+        _set_device_state(
+            session_token,
+            last_data=time.time(),
+            status='data_received',
+            data_received=True,
+            result=result
+        )
         
-        logger.info(f"Simulated mobile data processed for session {session_token}")
-        return jsonify(result)
+        logger.info("Simulated mobile data processed for session %s", session_token)
+        return _json(result)
         
     except Exception as e:
-        logger.error(f"Simulated mobile data error: {str(e)}", exc_info=True)
-        return jsonify({
+        logger.error("Simulated mobile data error: %s", e, exc_info=True)
+        return _json({
             'error': str(e),
             'status': 'error',
             'message': 'Failed to process simulated mobile data'
@@ -721,7 +1002,7 @@ def simulate_mobile_data():
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    return _json({
         'status': 'healthy',
         'message': 'BB84 QKD Simulator is running',
         'version': '1.0.0'
@@ -729,47 +1010,58 @@ def health_check():
 
 # Lab API Endpoints
 
+# Simulated lab metrics for /api/lab/data: base value and uniform variation range, in order
+# key rate, QBER, detection efficiency, sifted bits, photons transmitted, basis match rate,
+# privacy amplification ratio, channel utilization, processing latency, memory usage, accuracy
+_LAB_BASE = np.array([2.47, 8.3, 85, 847000, 1200000, 48, 0.7, 75, 12, 245, 99.2])
+_LAB_LOW = np.array([-0.3, -1.0, -5, -50000, -100000, -3, -0.1, -10, -3, -50, -0.5])
+_LAB_HIGH = np.array([0.3, 1.0, 5, 100000, 200000, 5, 0.1, 15, 8, 100, 0.3])
+
 @app.route('/api/lab/data', methods=['GET'])
 def get_lab_data():
     """Get real-time lab data for the interface"""
     try:
         # Generate realistic but simulated real-time data
-        import random
         current_time = time.time()
+        etag = _poll_etag(current_time)
+        not_modified = _not_modified(etag)
+        if not_modified is not None:
+            return not_modified
         
-        # Base metrics with some realistic variation
-        base_key_rate = 2.47 + random.uniform(-0.3, 0.3)
-        base_qber = 8.3 + random.uniform(-1.0, 1.0)
-        base_efficiency = 85 + random.uniform(-5, 5)
+        # Base metrics with some realistic variation, all drawn at once
+        (key_rate, qber, efficiency, sifted_bits, photons_transmitted, basis_match_rate, pa_ratio,
+         channel_utilization, processing_latency, memory_usage, accuracy) = (
+            _LAB_BASE + _RNG.uniform(_LAB_LOW, _LAB_HIGH)
+        ).tolist()
         
         data = {
-            'secure_key_rate': round(base_key_rate, 2),
-            'qber': round(max(0, base_qber), 1),
-            'sifted_bits': int(847000 + random.uniform(-50000, 100000)),
+            'secure_key_rate': round(key_rate, 2),
+            'qber': round(max(0, qber), 1),
+            'sifted_bits': int(sifted_bits),
             'security_parameter': '10⁻⁸',
-            'photons_transmitted': int(1200000 + random.uniform(-100000, 200000)),
-            'detection_efficiency': round(max(50, base_efficiency), 1),
-            'basis_match_rate': round(48 + random.uniform(-3, 5), 1),
-            'privacy_amplification_ratio': round(0.7 + random.uniform(-0.1, 0.1), 2),
-            'channel_utilization': round(75 + random.uniform(-10, 15), 1),
-            'processing_latency': round(12 + random.uniform(-3, 8), 1),
-            'memory_usage': round(245 + random.uniform(-50, 100), 1),
-            'simulation_accuracy': round(99.2 + random.uniform(-0.5, 0.3), 1),
+            'photons_transmitted': int(photons_transmitted),
+            'detection_efficiency': round(max(50, efficiency), 1),
+            'basis_match_rate': round(basis_match_rate, 1),
+            'privacy_amplification_ratio': round(pa_ratio, 2),
+            'channel_utilization': round(channel_utilization, 1),
+            'processing_latency': round(processing_latency, 1),
+            'memory_usage': round(memory_usage, 1),
+            'simulation_accuracy': round(accuracy, 1),
             'timestamp': current_time,
             'data_source': 'SIMULATED' if not lab_simulator.is_running else 'LAB_SIMULATION'
         }
         
-        return jsonify(data)
+        return _cache_for_poll(_json(data), etag)
     except Exception as e:
-        logger.error(f"Error getting lab data: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("Error getting lab data: %s", e)
+        return _json({'error': str(e)}), 500
 
 @app.route('/api/lab/update_lab_parameters', methods=['POST'])
 def update_lab_parameters():
     """Update lab simulation parameters"""
     try:
         params = request.get_json()
-        logger.info(f"Updating lab parameters: {params}")
+        logger.info("Updating lab parameters: %s", params)
         
         # If protocol variant is being changed, reset simulation state
         if 'protocol_variant' in params:
@@ -781,26 +1073,26 @@ def update_lab_parameters():
             lab_simulator.photons_received = 0
             lab_simulator.basis_matches = 0
             lab_simulator.final_key_bits = 0
-            lab_simulator.simulation_log = []  # Clear old logs
+            lab_simulator.simulation_log.clear()  # Clear old logs
         
         # Update the lab simulator parameters
         lab_simulator.update_parameters(params)
         
-        return jsonify({
+        return _json({
             'status': 'success',
             'updated_parameters': params,
             'message': 'Lab parameters updated successfully'
         })
     except Exception as e:
-        logger.error(f"Error updating lab parameters: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("Error updating lab parameters: %s", e)
+        return _json({'error': str(e)}), 500
 
 @app.route('/api/lab/run_simulation', methods=['POST'])
 def run_lab_simulation():
     """Start a lab simulation"""
     try:
         params = request.get_json()
-        logger.info(f"Starting lab simulation with parameters: {params}")
+        logger.info("Starting lab simulation with parameters: %s", params)
         
         # Update parameters first
         if params:
@@ -812,28 +1104,23 @@ def run_lab_simulation():
         # For now, we'll simulate the start - in a full implementation this would be threaded
         lab_simulator.is_running = True
         lab_simulator.progress = 0.0
-        lab_simulator.simulation_log = []
+        lab_simulator._sim_start_time = None
+        lab_simulator.simulation_log.clear()
         
         # Log with protocol variant information
-        protocol_name = {
-            'bb84': 'Standard BB84',
-            'decoy': 'Decoy State BB84', 
-            'sarg04': 'SARG04 Protocol',
-            'six-state': 'Six-State BB84',
-            'custom': 'Custom BB84'
-        }.get(lab_simulator.current_protocol_variant, 'BB84')
+        protocol_name = PROTOCOL_NAMES.get(lab_simulator.current_protocol_variant, 'BB84')
         
         lab_simulator.log_message(f"{protocol_name} simulation started from lab interface")
         
-        return jsonify({
+        return _json({
             'status': 'started',
             'simulation_id': f"lab_sim_{int(time.time())}",
             'parameters': params,
             'message': 'Lab simulation started successfully'
         })
     except Exception as e:
-        logger.error(f"Error starting lab simulation: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("Error starting lab simulation: %s", e)
+        return _json({'error': str(e)}), 500
 
 @app.route('/api/lab/stop_simulation', methods=['POST'])
 def stop_lab_simulation():
@@ -842,13 +1129,13 @@ def stop_lab_simulation():
         lab_simulator.is_running = False
         lab_simulator.log_message("Simulation stopped by user")
         
-        return jsonify({
+        return _json({
             'status': 'stopped',
             'message': 'Lab simulation stopped successfully'
         })
     except Exception as e:
-        logger.error(f"Error stopping lab simulation: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("Error stopping lab simulation: %s", e)
+        return _json({'error': str(e)}), 500
 
 @app.route('/api/lab/simulation_status', methods=['GET'])
 def get_lab_simulation_status():
@@ -857,11 +1144,11 @@ def get_lab_simulation_status():
         # For now, simulate realistic progress if running
         if lab_simulator.is_running:
             # Simulate gradual progress
-            current_time = time.time()
-            if not hasattr(lab_simulator, '_sim_start_time'):
-                lab_simulator._sim_start_time = current_time
+            now = time.monotonic()  # Elapsed-time math only; immune to wall-clock adjustments
+            if lab_simulator._sim_start_time is None:
+                lab_simulator._sim_start_time = now
             
-            elapsed = current_time - lab_simulator._sim_start_time
+            elapsed = now - lab_simulator._sim_start_time
             lab_simulator.progress = min(100, (elapsed / 30) * 100)  # 30 second simulation
             
             # Update metrics during simulation
@@ -881,19 +1168,19 @@ def get_lab_simulation_status():
                 lab_simulator.is_running = False
                 lab_simulator.log_message("Simulation completed successfully")
         
-        return jsonify({
+        return _json({
             'is_running': lab_simulator.is_running,
             'progress': lab_simulator.progress,
             'photons_sent': lab_simulator.photons_sent,
             'photons_received': lab_simulator.photons_received,
             'basis_matches': lab_simulator.basis_matches,
             'final_key_bits': lab_simulator.final_key_bits,
-            'log_entries': lab_simulator.simulation_log[-10:],  # Last 10 entries
+            'log_entries': list(lab_simulator.simulation_log)[-10:],  # Last 10 entries
             'timestamp': time.time()
         })
     except Exception as e:
-        logger.error(f"Error getting simulation status: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("Error getting simulation status: %s", e)
+        return _json({'error': str(e)}), 500
 
 @app.route('/api/lab/reset', methods=['POST'])
 def reset_lab():
@@ -901,16 +1188,14 @@ def reset_lab():
     try:
         lab_simulator.reset_parameters()
         lab_simulator.is_running = False
-        if hasattr(lab_simulator, '_sim_start_time'):
-            delattr(lab_simulator, '_sim_start_time')
         
-        return jsonify({
+        return _json({
             'status': 'reset',
             'message': 'Lab simulation reset successfully'
         })
     except Exception as e:
-        logger.error(f"Error resetting lab: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("Error resetting lab: %s", e)
+        return _json({'error': str(e)}), 500
 
 @app.route('/api/lab/export', methods=['GET'])
 def export_lab_data():
@@ -938,7 +1223,7 @@ def export_lab_data():
                 'progress': lab_simulator.progress,
                 'is_running': lab_simulator.is_running
             },
-            'simulation_log': lab_simulator.simulation_log.copy(),
+            'simulation_log': list(lab_simulator.simulation_log),
             'metadata': {
                 'exported_by': 'BB84_Lab_Interface',
                 'version': '1.0',
@@ -946,18 +1231,25 @@ def export_lab_data():
             }
         }
         
-        return jsonify(export_data)
+        return _json(export_data)
     except Exception as e:
-        logger.error(f"Error exporting lab data: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("Error exporting lab data: %s", e)
+        return _json({'error': str(e)}), 500
+
+# Number of points kept in the continuous simulation's QBER / key rate histories
+_CONTINUOUS_HISTORY_LEN = 100
+
+def _history_tail(history, n=20):
+    """Return the last n points of a history deque as a list"""
+    return list(islice(history, max(0, len(history) - n), None))
 
 # Global continuous simulation state
 continuous_simulation = {
     'running': False,
     'start_time': None,
     'data': {
-        'qber_history': [],
-        'key_rate_history': [],
+        'qber_history': deque(maxlen=_CONTINUOUS_HISTORY_LEN),
+        'key_rate_history': deque(maxlen=_CONTINUOUS_HISTORY_LEN),
         'metrics': {},
         'live_data': {}
     },
@@ -971,37 +1263,59 @@ def _continuous_simulation_worker(simulation_params):
     try:
         logger.info("🔄 Background continuous simulation worker started")
         
-        # Initialize simulation engine
-        simulator = BB84SimulationEngine()
-        
-        while continuous_simulation['running']:
-            # Generate simulation data in background
-            photon_rate = simulation_params.get('photon_rate', 1000)
-            distance = simulation_params.get('distance', 10)
-            noise = simulation_params.get('channel_noise', 0.1)
+        # This worker only ever writes to the session it was started for; a restart installs
+        # a fresh data dict, which also tells this worker to exit
+        session_data = continuous_simulation['data']
+        start_time = continuous_simulation['start_time']
+        
+        photon_rate = float(simulation_params.get('photon_rate', 1000))
+        distance = float(simulation_params.get('distance', 10))
+        noise = float(simulation_params.get('channel_noise', 0.1))
+        loss_factor, base_qber, channel_efficiency = continuous_run_constants(distance, noise)
+        metrics = session_data['metrics']
+        qber_history = session_data['qber_history']
+        key_rate_history = session_data['key_rate_history']
+        
+        while continuous_simulation['running'] and continuous_simulation['data'] is session_data:
+            current_time = time.time()  # Wall-clock timestamp reported to the client
+            elapsed = time.monotonic() - start_time
             
-            # Run a small batch simulation
-            current_time = time.time()
-            elapsed = current_time - continuous_simulation['start_time']
+            # Dynamic metrics based on elapsed time (compiled kernel)
+            (photons_sent, photons_received, current_qber, key_rate,
+             quantum_advantage, quantum_fidelity) = continuous_poll_metrics(
+                elapsed, photon_rate, loss_factor, base_qber, random.uniform(-0.01, 0.01))
             
-            # Simulate realistic quantum metrics
-            photons_sent = int(photon_rate * elapsed / 10)  # Smaller batches
-            photons_received = int(photons_sent * (1 - distance * 0.01) * (1 - noise))
+            # Update history (bounded deques drop the oldest point once full)
+            qber_history.append(current_qber)
+            key_rate_history.append(key_rate)
             
-            # Update shared state thread-safely
-            with continuous_simulation_lock:
-                if continuous_simulation['running']:  # Double-check still running
-                    continuous_simulation['data']['metrics'].update({
-                        'photons_sent': photons_sent,
-                        'photons_received': photons_received,
-                        'last_update': current_time
-                    })
+            metrics.update({
+                'photons_sent': photons_sent,
+                'photons_received': photons_received,
+                'key_generation_rate': key_rate,
+                'qber': current_qber,
+                'security_level': 'High' if current_qber < 0.11 else 'Compromised',
+                'quantum_advantage': quantum_advantage,
+                'channel_efficiency': channel_efficiency,
+                'quantum_fidelity': quantum_fidelity,
+                'last_update': current_time
+            })
+            
+            # Publish this tick as one immutable snapshot; replacing the reference is atomic
+            # under the GIL, so get_continuous_data serves it without locking or recomputing
+            session_data['snapshot'] = {
+                'metrics': dict(metrics),
+                'qber_history': _history_tail(qber_history),  # Last 20 points
+                'key_rate_history': _history_tail(key_rate_history),
+                'timestamp': current_time,
+                'elapsed_time': elapsed
+            }
             
             # Sleep to prevent CPU overload and allow stop requests
             time.sleep(0.5)  # 500ms intervals for responsive stopping
             
     except Exception as e:
-        logger.error(f"❌ Background simulation worker error: {str(e)}")
+        logger.error("❌ Background simulation worker error: %s", e)
     finally:
         logger.info("🛑 Background continuous simulation worker stopped")
 
@@ -1012,7 +1326,7 @@ def start_continuous_simulation():
     
     try:
         data = request.get_json()
-        logger.info(f"🔄 Starting continuous simulation with parameters: {data}")
+        logger.info("🔄 Starting continuous simulation with parameters: %s", data)
         
         # Thread-safe simulation control
         with continuous_simulation_lock:
@@ -1025,11 +1339,11 @@ def start_continuous_simulation():
             
             # Initialize continuous simulation state
             continuous_simulation['running'] = True
-            continuous_simulation['start_time'] = time.time()
+            continuous_simulation['start_time'] = time.monotonic()
             continuous_simulation['parameters'] = data
             continuous_simulation['data'] = {
-                'qber_history': [],
-                'key_rate_history': [],
+                'qber_history': deque(maxlen=_CONTINUOUS_HISTORY_LEN),
+                'key_rate_history': deque(maxlen=_CONTINUOUS_HISTORY_LEN),
                 'metrics': {
                     'photons_sent': 0,
                     'photons_received': 0,
@@ -1049,7 +1363,7 @@ def start_continuous_simulation():
         continuous_simulation_thread.start()
         
         logger.info("✅ Continuous simulation started successfully in background thread")
-        return jsonify({
+        return _json({
             'status': 'success',
             'message': 'Continuous simulation started in background',
             'simulation_id': f"continuous_{int(time.time())}",
@@ -1058,8 +1372,8 @@ def start_continuous_simulation():
         })
         
     except Exception as e:
-        logger.error(f"❌ Error starting continuous simulation: {str(e)}")
-        return jsonify({
+        logger.error("❌ Error starting continuous simulation: %s", e)
+        return _json({
             'status': 'error',
             'message': f'Failed to start continuous simulation: {str(e)}'
         }), 500
@@ -1072,19 +1386,19 @@ def stop_continuous_simulation():
             continuous_simulation['running'] = False
             logger.info("🛑 Continuous simulation stopped by user")
             
-            return jsonify({
+            return _json({
                 'status': 'success',
                 'message': 'Continuous simulation stopped'
             })
         else:
-            return jsonify({
+            return _json({
                 'status': 'info',
                 'message': 'No continuous simulation was running'
             })
             
     except Exception as e:
-        logger.error(f"❌ Error stopping continuous simulation: {str(e)}")
-        return jsonify({
+        logger.error("❌ Error stopping continuous simulation: %s", e)
+        return _json({
             'status': 'error',
             'message': f'Failed to stop continuous simulation: {str(e)}'
         }), 500
@@ -1094,116 +1408,90 @@ def get_continuous_data():
     """Get real-time data from continuous simulation"""
     try:
         if not continuous_simulation['running']:
-            return jsonify({
+            return _json({
                 'status': 'info',
                 'message': 'No continuous simulation running',
                 'data': None
             })
         
-        # Generate real-time simulation data
-        current_time = time.time()
-        elapsed = current_time - continuous_simulation['start_time']
-        
-        # Simulate photon rate based metrics
-        photon_rate = continuous_simulation['parameters'].get('photon_rate', 1000)
-        distance = continuous_simulation['parameters'].get('distance', 10)
-        noise = continuous_simulation['parameters'].get('channel_noise', 0.1)
-        
-        # Calculate dynamic metrics based on elapsed time
-        photons_sent = int(photon_rate * elapsed)
-        photons_received = int(photons_sent * (1 - distance * 0.01) * (1 - noise))
-        
-        # Dynamic QBER calculation with realistic fluctuations
-        base_qber = noise * 0.5 + distance * 0.001
-        qber_fluctuation = random.uniform(-0.01, 0.01) * np.sin(elapsed * 0.5)
-        current_qber = max(0, base_qber + qber_fluctuation)
-        
-        # Key generation rate (realistic calculation)
-        key_rate = max(0, photons_received * 0.5 * (1 - current_qber * 2) / elapsed if elapsed > 0 else 0)
-        
-        # Update history arrays
-        continuous_simulation['data']['qber_history'].append(current_qber)
-        continuous_simulation['data']['key_rate_history'].append(key_rate)
-        
-        # Keep history manageable (last 100 points)
-        if len(continuous_simulation['data']['qber_history']) > 100:
-            continuous_simulation['data']['qber_history'].pop(0)
-            continuous_simulation['data']['key_rate_history'].pop(0)
-        
-        # Update metrics
-        continuous_simulation['data']['metrics'].update({
-            'photons_sent': photons_sent,
-            'photons_received': photons_received,
-            'key_generation_rate': key_rate,
-            'qber': current_qber,
-            'security_level': 'High' if current_qber < 0.11 else 'Compromised',
-            'quantum_advantage': max(20, 100 - current_qber * 1000),
-            'channel_efficiency': max(0.1, 1 - distance * 0.02 - noise),
-            'quantum_fidelity': max(0.85, 1 - current_qber * 2)
-        })
+        # Serve the worker's latest tick as-is
+        snapshot = continuous_simulation['data'].get('snapshot')
+        if snapshot is None:
+            # Worker has not finished its first tick yet
+            snapshot = {
+                'metrics': continuous_simulation['data']['metrics'],
+                'qber_history': [],
+                'key_rate_history': [],
+                'timestamp': time.time(),
+                'elapsed_time': 0.0
+            }
         
-        return jsonify({
-            'status': 'success',
-            'metrics': continuous_simulation['data']['metrics'],
-            'qber_history': continuous_simulation['data']['qber_history'][-20:],  # Last 20 points
-            'key_rate_history': continuous_simulation['data']['key_rate_history'][-20:],
-            'timestamp': current_time,
-            'elapsed_time': elapsed
-        })
+        return _json({'status': 'success', **snapshot})
         
     except Exception as e:
-        logger.error(f"❌ Error getting continuous data: {str(e)}")
-        return jsonify({
+        logger.error("❌ Error getting continuous data: %s", e)
+        return _json({
             'status': 'error',
             'message': f'Failed to get continuous data: {str(e)}'
         }), 500
 
+# Ranges for get_testbed_live_metrics: qber, detection_rate, gate_fidelity,
+# decoherence_time (us), temperature (K), dark_count_rate (Hz)
+_LIVE_METRICS_LOW = np.array([0.02, 0.15, 0.95, 50, 0.01, 100])
+_LIVE_METRICS_HIGH = np.array([0.08, 0.35, 0.99, 150, 0.05, 500])
+# Half-widths of the QBER / detection rate history fluctuations
+_LIVE_HISTORY_SPREAD = np.array([[0.01], [0.05]])
+
 @app.route('/api/testbed/live_metrics', methods=['GET'])
 def get_testbed_live_metrics():
     """Get live metrics from quantum device testbed"""
     try:
         # Initialize testbed if needed
-        testbed = QuantumDeviceTestbed()
+        testbed = _testbed()
         
         # Generate realistic live device metrics
         current_time = time.time()
-        
-        # Simulate device calibration data with realistic fluctuations
+        etag = _poll_etag(current_time)
+        not_modified = _not_modified(etag)
+        if not_modified is not None:
+            return not_modified
+        
+        # Simulate device calibration data with realistic fluctuations (one draw for all fields)
+        qber, detection_rate, gate_fidelity, decoherence_time, temperature, dark_count_rate = \
+            _RNG.uniform(_LIVE_METRICS_LOW, _LIVE_METRICS_HIGH).tolist()
         base_metrics = {
-            'qber': random.uniform(0.02, 0.08),
-            'detection_rate': random.uniform(0.15, 0.35),
-            'gate_fidelity': random.uniform(0.95, 0.99),
-            'decoherence_time': random.uniform(50, 150),  # microseconds
-            'temperature': random.uniform(0.01, 0.05),  # Kelvin
-            'dark_count_rate': random.uniform(100, 500),  # Hz
+            'qber': qber,
+            'detection_rate': detection_rate,
+            'gate_fidelity': gate_fidelity,
+            'decoherence_time': decoherence_time,  # microseconds
+            'temperature': temperature,  # Kelvin
+            'dark_count_rate': dark_count_rate,  # Hz
         }
         
+        # 20-point QBER / detection rate histories around the current values
+        history = _RNG.uniform(-1.0, 1.0, (2, 20)) * _LIVE_HISTORY_SPREAD
+        history += ((qber,), (detection_rate,))
+        
         # Add timestamp and device status
         live_metrics = {
             'status': 'connected',
             'timestamp': current_time,
             'device_name': 'IBM Quantum Simulator',
             'metrics': base_metrics,
-            'qber_over_time': [
-                base_metrics['qber'] + random.uniform(-0.01, 0.01) 
-                for _ in range(20)
-            ],
-            'detection_rate_over_time': [
-                base_metrics['detection_rate'] + random.uniform(-0.05, 0.05) 
-                for _ in range(20)
-            ]
+            'qber_over_time': history[0].tolist(),
+            'detection_rate_over_time': history[1].tolist()
         }
         
         testbed.log_message(f"Live metrics retrieved: QBER={base_metrics['qber']:.3f}")
         
-        return jsonify({
+        return _cache_for_poll(_json({
             'status': 'success',
             'data': live_metrics
-        })
+        }), etag)
         
     except Exception as e:
-        logger.error(f"❌ Error getting testbed live metrics: {str(e)}")
-        return jsonify({
+        logger.error("❌ Error getting testbed live metrics: %s", e)
+        return _json({
             'status': 'error',
             'message': f'Failed to get live metrics: {str(e)}'
         }), 500
@@ -1217,19 +1505,17 @@ def generate_circuit_diagram():
         bit = data.get('bit', '0')
         basis = data.get('basis', '+')
         
-        simulator = BB84SimulationEngine()
-        
         if circuit_type == 'alice':
             # Generate Alice's encoding circuit with JSON data
-            circuit_data = simulator.generate_alice_encoding_circuit(bit, basis)
+            circuit_data = _alice_circuit(bit, basis)
         elif circuit_type == 'bob':
             # Generate Bob's measurement circuit with JSON data
-            circuit_data = simulator.generate_bob_measurement_circuit(basis)
+            circuit_data = _bob_circuit(basis)
         else:
-            return jsonify({'error': 'Invalid circuit type'}), 400
+            return _json({'error': 'Invalid circuit type'}), 400
         
         if circuit_data and circuit_data.get('status') == 'success':
-            return jsonify({
+            return _json({
                 'status': 'success',
                 'circuit_image': circuit_data.get('image'),
                 'circuit_json': circuit_data.get('circuit_json'),
@@ -1243,14 +1529,14 @@ def generate_circuit_diagram():
                 'possible_outcomes': circuit_data.get('circuit_json', {}).get('possible_outcomes', [])
             })
         else:
-            return jsonify({
+            return _json({
                 'status': 'error',
                 'message': 'Failed to generate circuit diagram'
             }), 500
             
     except Exception as e:
-        logger.error(f"Circuit diagram generation error: {str(e)}")
-        return jsonify({
+        logger.error("Circuit diagram generation error: %s", e, exc_info=True)
+        return _json({
             'error': str(e),
             'status': 'error',
             'message': 'Circuit diagram generation failed'
@@ -1260,8 +1546,7 @@ def generate_circuit_diagram():
 def get_advanced_metrics():
     """Get advanced quantum metrics for lab analysis using new lab simulator"""
     try:
-        # Initialize lab simulator
-        lab_simulator = BB84LabSimulator()
+        lab_simulator = _metrics_lab()
         
         # Get simulation result from request or use sample data
         simulation_result = {}
@@ -1314,15 +1599,15 @@ def get_advanced_metrics():
         advanced_metrics['last_updated'] = time.time()
         advanced_metrics['simulation_distance_km'] = simulation_result.get('distance', 25.0)
         
-        return jsonify({
+        return _json({
             'status': 'success',
             'metrics': advanced_metrics,
             'timestamp': time.strftime('%H:%M:%S')
         })
         
     except Exception as e:
-        logger.error(f"Advanced metrics error: {str(e)}")
-        return jsonify({
+        logger.error("Advanced metrics error: %s", e)
+        return _json({
             'error': str(e),
             'status': 'error',
             'message': 'Failed to calculate advanced metrics'
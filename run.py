@@ -4,7 +4,8 @@ Simple startup script for BB84 Quantum Simulator
 Automatically configures all external APIs and dependencies.
 
 Usage:
-    python run.py              # Run on localhost:5000
+    python run.py              # Run on localhost:5000 (waitress if installed)
+    python run.py --debug      # Flask debug server with reloader
     python run.py --host 0.0.0.0 --port 8080  # Custom host/port
     python run.py --production  # Production mode with Gunicorn
 """
@@ -39,6 +40,8 @@ def main():
             'gunicorn',
             '--bind', f'{args.host}:{args.port}',
             '--workers', '4',
+            '--worker-class', 'gthread',  # Threaded workers for the polling endpoints
+            '--threads', '8',
             '--timeout', '300',
             '--keep-alive', '2',
             '--log-level', 'info',
@@ -47,15 +50,10 @@ def main():
         print(f"🚀 Starting production server on {args.host}:{args.port}")
         subprocess.run(cmd)
     else:
-        # Development mode with Flask
-        from app import app
-        print(f"🚀 Starting development server on {args.host}:{args.port}")
-        print("💡 Use --production flag for production deployment")
-        app.run(
-            host=args.host, 
-            port=args.port, 
-            debug=args.debug or True
-        )
+        from app import run_server
+        if not args.debug:
+            print("💡 Use --production for Gunicorn")
+        run_server(host=args.host, port=args.port, debug=args.debug)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -402,6 +402,7 @@ class BB84Simulator {
                 body: JSON.stringify(simulationData)
             });
 
+            // Real quantum computer results are streamed: the body completes when IBM Quantum returns
             const result = await response.json();
             console.log('📊 Simulation result:', result);
 